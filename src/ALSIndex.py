@@ -0,0 +1,98 @@
+from src.Bitboard import HOUSES, board_indices, seen_by_all
+
+
+def find_almost_locked_sets(masks: list[int], house: tuple[int, ...]) -> list[tuple[int, int]]:
+    """
+    Return the almost locked sets in house as (board, mask) pairs,
+    where board holds the cells (c.f. src.Bitboard) and mask their
+    combined options.
+    """
+    empty = [index for index in house if masks[index]]
+    found = []
+    # Each entry is (next position in empty, board, mask, size of board).
+    stack = [(0, 0, 0, 0)]
+    while stack:
+        start, board, mask, size = stack.pop()
+        for position in range(start, len(empty)):
+            index = empty[position]
+            new_mask = mask | masks[index]
+            count = new_mask.bit_count()
+            if count > len(empty):
+                continue
+            new_board = board | 1 << index
+            if count == size + 2:
+                found.append((new_board, new_mask))
+            if size + 2 < len(empty):
+                stack.append((position + 1, new_board, new_mask, size + 1))
+    return found
+
+
+class ALSIndex:
+    """
+    The almost locked sets (ALSs) of a sudoku: groups of n cells in a
+    house with n + 1 options between them. Single cells with two
+    options count as ALSs.
+
+    The index keeps the house versions (c.f. Sudoku.update_versions) it
+    was last updated with, and update() only searches houses again if
+    they have changed since then.
+    """
+
+    def __init__(self) -> None:
+        self.house_versions: list[int] = [-1] * len(HOUSES)
+        self.planes: list[int] = [0] * 9
+        self.by_house: list[list[tuple[int, int]]] = [[] for _ in HOUSES]
+
+    def update(self, sudoku) -> None:
+        """Bring the index up to date with sudoku (c.f. Sudoku.updated)."""
+        for house in sudoku.changed_houses(self.house_versions):
+            self.by_house[house] = find_almost_locked_sets(sudoku.masks, HOUSES[house])
+        self.house_versions[:] = sudoku.house_versions
+        self.planes = sudoku.planes
+
+    def almost_locked_sets(self) -> list[tuple[int, int]]:
+        """
+        Return each ALS once, even if it lies in more than one house.
+        """
+        return list(dict.fromkeys(als for house in self.by_house for als in house))
+
+    def restricted_commons(self, a: tuple[int, int], b: tuple[int, int]) -> int:
+        """
+        Return a mask of the digits which are restricted common to a and
+        b: every cell in a that can be the digit sees every cell in b
+        that can be the digit, so it can be in at most one of them.
+        Overlapping ALSs have no restricted commons.
+        """
+        if a[0] & b[0]:
+            return 0
+        restricted = 0
+        common = a[1] & b[1]
+        while common:
+            bit = common & -common
+            common ^= bit
+            plane = self.planes[bit.bit_length() - 1]
+            a_cells = a[0] & plane
+            b_cells = b[0] & plane
+            if b_cells & ~seen_by_all(a_cells) == 0:
+                restricted |= bit
+        return restricted
+
+    def shared_digit_eliminations(self, digits: int, *sets: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Return (index, digit) pairs for candidates outside sets which
+        see every cell in sets that can be one of digits.
+        """
+        board = 0
+        for als in sets:
+            board |= als[0]
+        eliminations = []
+        while digits:
+            bit = digits & -digits
+            digits ^= bit
+            digit = bit.bit_length()
+            plane = self.planes[digit - 1]
+            if not board & plane:
+                continue
+            targets = seen_by_all(board & plane) & plane & ~board
+            eliminations.extend((index, digit) for index in board_indices(targets))
+        return eliminations
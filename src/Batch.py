@@ -0,0 +1,201 @@
+"""
+Solve many sudokus at once with NumPy.
+
+A BatchSolver holds N puzzles as an (N, 81) array of digits and an
+(N, 81) array of candidate masks (c.f. src.Bitboard), and applies
+singles, locked candidates and naked and hidden pairs to every puzzle
+in one set of array operations. Puzzles which stall are handed to
+src.Solver, one at a time, for the harder strategies.
+
+NumPy is optional: everything else in the package runs without it, and
+BatchSolver raises ImportError if it is missing.
+"""
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.Bitboard import ALL_DIGITS, CELL_HOUSES, HOUSES, KEYS, MINI_LINES, board_indices
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+if np is not None:
+    from src.CandidateTensor import CELL_HOUSE_INDEX, HOUSE_INDEX, PEER_INDEX
+
+    # Where each cell comes in each of its houses.
+    CELL_HOUSE_POSITION = np.array([[HOUSES[h].index(i) for h in CELL_HOUSES[i]] for i in range(81)], dtype=np.intp)
+    # The cells, line and box of each mini-line, and the cells of its
+    # line and of its box which are not in it.
+    MINI_INDEX = np.array([board_indices(board) for _, _, board in MINI_LINES], dtype=np.intp)
+    MINI_LINE = np.array([line for line, _, _ in MINI_LINES], dtype=np.intp)
+    MINI_BOX = np.array([box for _, box, _ in MINI_LINES], dtype=np.intp)
+    LINE_REST = np.array([[i for i in HOUSES[line] if not board >> i & 1] for line, _, board in MINI_LINES],
+                         dtype=np.intp)
+    BOX_REST = np.array([[i for i in HOUSES[box] if not board >> i & 1] for _, box, board in MINI_LINES],
+                        dtype=np.intp)
+    BITS = (1 << np.arange(9)).astype(np.uint16)
+    POPCOUNT = np.array([mask.bit_count() for mask in range(512)], dtype=np.uint8)
+    LOWEST_DIGIT = np.array([(mask & -mask).bit_length() for mask in range(512)], dtype=np.uint8)
+
+
+def candidate_bits(masks: "np.ndarray") -> "np.ndarray":
+    """Return a boolean array, with a last axis of nine digits, of the digits in masks."""
+    return (masks[..., None] >> np.arange(9)) & 1 == 1
+
+
+def bits_mask(bits: "np.ndarray") -> "np.ndarray":
+    """Return the candidate masks of a boolean array of digits (c.f. candidate_bits())."""
+    return (bits * BITS).sum(axis=-1, dtype=np.uint16)
+
+
+def clear_filled_digits(grids: "np.ndarray", masks: "np.ndarray") -> "np.ndarray":
+    """Return masks without the digits filled in any of each cell's peers."""
+    shifts = np.maximum(grids, 1).astype(np.uint16) - 1
+    filled = np.where(grids > 0, np.left_shift(1, shifts), 0).astype(np.uint16)
+    return masks & ~np.bitwise_or.reduce(filled[:, PEER_INDEX], axis=2)
+
+
+def fill_singles(grids: "np.ndarray", masks: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Return grids and masks after filling every naked single (a cell
+    with one option) and hidden single (the only place for a digit in a
+    house) and removing the new digits from their peers.
+    """
+    naked = np.where(POPCOUNT[masks] == 1, masks, 0)
+    bits = candidate_bits(masks)
+    unique = bits[:, HOUSE_INDEX, :].sum(axis=2) == 1
+    hidden = bits_mask(bits & unique[:, CELL_HOUSE_INDEX, :].any(axis=2))
+    singles = np.where(naked != 0, naked, hidden)
+    placed = singles != 0
+    grids = np.where(placed, LOWEST_DIGIT[singles], grids).astype(np.uint8)
+    masks = np.where(placed, 0, masks).astype(np.uint16)
+    return grids, clear_filled_digits(grids, masks)
+
+
+def clear_locked_candidates(masks: "np.ndarray") -> "np.ndarray":
+    """
+    Return masks without digits whose places in a box lie in one line
+    in the rest of the line, or whose places in a line lie in one box in
+    the rest of the box.
+    """
+    bits = candidate_bits(masks)
+    in_mini = bits[:, MINI_INDEX, :].sum(axis=2)
+    in_house = bits[:, HOUSE_INDEX, :].sum(axis=2)
+    in_line, in_box = in_house[:, MINI_LINE, :], in_house[:, MINI_BOX, :]
+    pointing = bits_mask((in_mini > 0) & (in_mini == in_box) & (in_line > in_mini))
+    claiming = bits_mask((in_mini > 0) & (in_mini == in_line) & (in_box > in_mini))
+    removed = np.zeros_like(masks)
+    for m in range(len(MINI_LINES)):
+        removed[:, LINE_REST[m]] |= pointing[:, m, None]
+        removed[:, BOX_REST[m]] |= claiming[:, m, None]
+    return masks & ~removed
+
+
+def clear_pairs(masks: "np.ndarray") -> "np.ndarray":
+    """
+    Return masks without the options removed by naked pairs (two cells
+    in a house with the same two options) and hidden pairs (two digits
+    with the same two places in a house).
+    """
+    house_masks = masks[:, HOUSE_INDEX]
+    bits = candidate_bits(house_masks)
+    positions = bits_mask(np.swapaxes(bits, 2, 3))
+    # A cell is in a naked pair if one other cell in the house has the
+    # same two options, and a digit in a hidden pair if one other digit
+    # has the same two places. Each cell keeps the digits of its own
+    # pairs and loses those of the house's other naked pairs.
+    naked = (POPCOUNT[house_masks] == 2) & ((house_masks[..., :, None] == house_masks[..., None, :]).sum(axis=-1) == 2)
+    naked_masks = np.where(naked, house_masks, 0).astype(np.uint16)
+    removed = np.bitwise_or.reduce(naked_masks, axis=2)[..., None] & ~naked_masks
+    hidden = (POPCOUNT[positions] == 2) & ((positions[..., :, None] == positions[..., None, :]).sum(axis=-1) == 2)
+    keep = bits_mask(bits & hidden[..., None, :])
+    removed |= np.where(keep != 0, ALL_DIGITS & ~keep, 0).astype(np.uint16)
+    return masks & ~np.bitwise_or.reduce(removed[:, CELL_HOUSE_INDEX, CELL_HOUSE_POSITION], axis=2)
+
+
+class BatchSolver:
+    """
+    Many sudokus, solved together with singles, locked candidates and
+    naked and hidden pairs.
+
+    grids holds the digit in each cell of each puzzle (0 if empty), and
+    masks the candidate masks of its empty cells (0 if filled).
+    """
+
+    def __init__(self, puzzles: Sequence[str]) -> None:
+        if np is None:
+            raise ImportError("BatchSolver needs NumPy, which is not installed.")
+        rows = []
+        for puzzle in puzzles:
+            puzzle = puzzle.replace("\n", "")
+            if len(puzzle) != 81:
+                raise ValueError(f"Your sudoku contains {len(puzzle)} digits rather than 81.")
+            rows.append(["123456789".find(character) + 1 for character in puzzle])
+        self.givens = np.array(rows, dtype=np.uint8).reshape(-1, 81)
+        self.grids = self.givens.copy()
+        self.masks = clear_filled_digits(self.grids, np.where(self.grids == 0, ALL_DIGITS, 0).astype(np.uint16))
+
+    def __len__(self) -> int:
+        return len(self.grids)
+
+    def run(self) -> None:
+        """
+        Apply every strategy to every puzzle until none of them changes,
+        dropping each puzzle from the batch once a round leaves it as it
+        was.
+        """
+        active = np.arange(len(self))
+        while active.size:
+            grids, masks = fill_singles(self.grids[active], self.masks[active])
+            masks = clear_pairs(clear_locked_candidates(masks))
+            changed = (masks != self.masks[active]).any(axis=1)
+            self.grids[active], self.masks[active] = grids, masks
+            active = active[changed]
+
+    def solve(self) -> list[str]:
+        """
+        Solve every puzzle as far as possible, handing those which stall
+        to src.Solver, and return them as 81-character strings with
+        spaces for empty cells.
+        """
+        self.run()
+        solved = self.strings()
+        for n in self.stalled():
+            sudoku = self.sudoku(n)
+            Solver(sudoku).main()
+            solved[n] = "".join(" " if cell.is_empty else str(cell.digit) for cell in sudoku)
+        return solved
+
+    def strings(self) -> list[str]:
+        """Return each puzzle as an 81-character string with spaces for empty cells."""
+        return ["".join(str(digit) if digit else " " for digit in row) for row in self.grids.tolist()]
+
+    def broken(self) -> "np.ndarray":
+        """
+        Return whether each puzzle has an empty cell with no options or
+        a digit twice in a house.
+        """
+        filled = self.grids[..., None] == np.arange(1, 10)
+        repeated = (filled[:, HOUSE_INDEX, :].sum(axis=2) > 1).any(axis=(1, 2))
+        return ((self.grids == 0) & (self.masks == 0)).any(axis=1) | repeated
+
+    def stalled(self) -> list[int]:
+        """Return the numbers of the puzzles which are unfinished but not broken."""
+        return np.flatnonzero((self.grids == 0).any(axis=1) & ~self.broken()).tolist()
+
+    def sudoku(self, n: int) -> Sudoku:
+        """
+        Return puzzle n as a Sudoku with the same pencil marks, in which
+        only the original digits count as given.
+        """
+        grid, masks = self.grids[n].tolist(), self.masks[n].tolist()
+        edited = {
+            KEYS[i]: {d for d in range(1, 10) if not mask >> (d - 1) & 1}
+            for i, mask in enumerate(masks) if not grid[i]
+        }
+        sudoku = Sudoku.from_string(self.strings()[n], edited)
+        for i, given in enumerate(self.givens[n].tolist()):
+            sudoku[KEYS[i]].started_empty = not given
+        return sudoku
@@ -0,0 +1,172 @@
+"""
+Index tables and bit helpers for the mask-based parts of the solver.
+
+Cells are numbered 0-80 in the same order as Sudoku.CELL_KEYS, so the
+cell at (x, y) has index 9 * y + x. A candidate mask stores digit d as
+bit d - 1, so a cell which can be any digit has the mask 0b111111111.
+"""
+from itertools import combinations, product
+from typing import Callable, Generator, Iterable
+
+ALL_DIGITS = 0x1FF
+BOARD = (1 << 81) - 1
+
+KEYS: tuple = tuple((x, y) for y, x in product(range(9), repeat=2))
+INDEX: dict = {key: i for i, key in enumerate(KEYS)}
+
+ROWS: tuple = tuple(tuple(9 * y + x for x in range(9)) for y in range(9))
+COLUMNS: tuple = tuple(tuple(9 * y + x for y in range(9)) for x in range(9))
+BOXES: tuple = tuple(
+    tuple(9 * (3 * (b // 3) + j) + 3 * (b % 3) + i for j in range(3) for i in range(3))
+    for b in range(9)
+)
+# Houses 0-8 are rows, 9-17 are columns and 18-26 are boxes.
+HOUSES: tuple = ROWS + COLUMNS + BOXES
+
+CELL_HOUSES: tuple = tuple(
+    (i // 9, 9 + i % 9, 18 + 3 * (i // 27) + (i % 9) // 3) for i in range(81)
+)
+PEERS: tuple = tuple(
+    tuple(sorted({p for h in CELL_HOUSES[i] for p in HOUSES[h]} - {i})) for i in range(81)
+)
+
+# A board is an 81-bit int with bit i set for each cell index i in it.
+HOUSE_BOARDS: tuple = tuple(sum(1 << i for i in house) for house in HOUSES)
+PEER_BOARDS: tuple = tuple(sum(1 << p for p in PEERS[i]) for i in range(81))
+
+# The 54 intersections of a row or column with a box, as (line, box,
+# board), with line and box numbered as in HOUSES.
+MINI_LINES: tuple = tuple(
+    (line, box, HOUSE_BOARDS[line] & HOUSE_BOARDS[box])
+    for line in range(18) for box in range(18, 27)
+    if HOUSE_BOARDS[line] & HOUSE_BOARDS[box]
+)
+
+# Every rectangle of cells spanning exactly two boxes, as the indices of
+# its (top left, top right, bottom left, bottom right) corners.
+RECTANGLES: tuple = tuple(
+    (9 * top + left, 9 * top + right, 9 * bottom + left, 9 * bottom + right)
+    for top, bottom in combinations(range(9), 2)
+    for left, right in combinations(range(9), 2)
+    if (top // 3 == bottom // 3) != (left // 3 == right // 3)
+)
+CELL_RECTANGLES: tuple = tuple(
+    tuple(r for r, rectangle in enumerate(RECTANGLES) if i in rectangle) for i in range(81)
+)
+
+# For each of the 512 masks of places in a box, with bit 3 * row + column
+# set for each place, the (row, column) pairs within the box whose lines
+# together hold every place although neither does alone. Masks with no
+# such pair are not empty rectangles.
+EMPTY_RECTANGLES: tuple = tuple(
+    tuple(
+        (row, column) for row in range(3) for column in range(3)
+        if not mask & ~(0b111 << 3 * row | 0b1001001 << column)
+        and mask & ~(0b111 << 3 * row) and mask & ~(0b1001001 << column)
+    )
+    for mask in range(512)
+)
+
+
+# The digits in each of the 512 candidate masks, so that hot loops can
+# look them up instead of building a list (c.f. mask_digits()).
+MASK_DIGITS: tuple = tuple(tuple(d for d in range(1, 10) if mask >> (d - 1) & 1) for mask in range(512))
+
+
+def digit_bit(digit: int) -> int:
+    """Return the candidate mask bit for digit."""
+    return 1 << (digit - 1)
+
+
+def digits_mask(digits) -> int:
+    """Return the candidate mask containing each digit in digits."""
+    mask = 0
+    for digit in digits:
+        mask |= 1 << (digit - 1)
+    return mask
+
+
+def mask_digits(mask: int) -> list[int]:
+    """Return the digits whose bits are set in a candidate mask."""
+    return [d for d in range(1, 10) if mask >> (d - 1) & 1]
+
+
+def board_indices(board: int) -> list[int]:
+    """Return the cell indices whose bits are set in a board."""
+    indices = []
+    while board:
+        low = board & -board
+        indices.append(low.bit_length() - 1)
+        board ^= low
+    return indices
+
+
+def seen_by_all(board: int) -> int:
+    """Return the board of cells that see every cell in board."""
+    seen = BOARD
+    while board:
+        low = board & -board
+        seen &= PEER_BOARDS[low.bit_length() - 1]
+        board ^= low
+    return seen
+
+
+def digit_planes(masks: list[int]) -> list[int]:
+    """
+    Return a list of nine boards, the board at d - 1 holding the cells
+    whose mask contains digit d.
+    """
+    planes = [0] * 9
+    for index, mask in enumerate(masks):
+        cell_bit = 1 << index
+        while mask:
+            low = mask & -mask
+            planes[low.bit_length() - 1] |= cell_bit
+            mask ^= low
+    return planes
+
+
+def seen_by_any(board: int) -> int:
+    """Return the board of cells that see at least one cell in board."""
+    seen = 0
+    while board:
+        low = board & -board
+        seen |= PEER_BOARDS[low.bit_length() - 1]
+        board ^= low
+    return seen
+
+
+def box_positions(board: int, box: int) -> int:
+    """
+    Return the mask of the cells of board in box, with bit 3 * row +
+    column set for the cell at that row and column within the box.
+    """
+    shift = 27 * (box // 3) + 3 * (box % 3)
+    return (board >> shift & 0b111) | (board >> (shift + 6) & 0b111000) | (board >> (shift + 12) & 0b111000000)
+
+
+def empty_rectangle_lines(plane: int, box: int) -> list[tuple[int, int]]:
+    """
+    Return the (row, column) pairs through box which make the places
+    for a digit in plane an empty rectangle (c.f. EMPTY_RECTANGLES).
+    """
+    return [(3 * (box // 3) + row, 3 * (box % 3) + column)
+            for row, column in EMPTY_RECTANGLES[box_positions(plane, box)]]
+
+
+def rectangles_where(masks: list[int], predicate: Callable[[int, int, int, int], bool], bivalues,
+                     cells: Iterable[int] = None) -> Generator[tuple[int, int, int, int], None, None]:
+    """
+    Yield each of RECTANGLES with a corner in bivalues, a
+    src.BivalueIndex, whose corners' candidate masks, in order, satisfy
+    predicate. Only the rectangles of bivalue cells are tried, so
+    predicate should need at least one corner to be bivalue. If cells
+    is given, rectangles without a corner in cells are skipped too.
+    """
+    numbers = {r for i in bivalues.cells() for r in CELL_RECTANGLES[i]}
+    if cells is not None:
+        numbers.intersection_update(r for i in cells for r in CELL_RECTANGLES[i])
+    for r in sorted(numbers):
+        a, b, c, d = RECTANGLES[r]
+        if predicate(masks[a], masks[b], masks[c], masks[d]):
+            yield RECTANGLES[r]
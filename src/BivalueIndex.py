@@ -0,0 +1,77 @@
+from src.Bitboard import HOUSES, PEERS
+from src.LinkGraph import two_colour
+
+
+class BivalueIndex:
+    """
+    The cells of a sudoku which have exactly two options, grouped by
+    their candidate mask (c.f. src.Bitboard), with each one linked to
+    the other bivalue cells it sees.
+
+    The index keeps the house versions (c.f. Sudoku.update_versions) it
+    was last updated with, and update() only re-files the cells of
+    houses which have changed since then.
+    """
+
+    def __init__(self) -> None:
+        self.house_versions: list[int] = [-1] * len(HOUSES)
+        self.pair_of: dict[int, int] = {}
+        self.by_pair: dict[int, set[int]] = {}
+        self.links: dict[int, set[int]] = {}
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.links
+
+    def update(self, sudoku) -> None:
+        """Bring the index up to date with sudoku (c.f. Sudoku.updated)."""
+        masks = sudoku.masks
+        cells = {index for house in sudoku.changed_houses(self.house_versions) for index in HOUSES[house]}
+        for index in cells:
+            if self.pair_of.get(index, 0) == masks[index]:
+                continue
+            if index in self.pair_of:
+                self.remove(index, self.pair_of.pop(index))
+            if masks[index].bit_count() == 2:
+                self.pair_of[index] = masks[index]
+                self.add(index, masks[index])
+        self.house_versions[:] = sudoku.house_versions
+
+    def add(self, index: int, pair: int) -> None:
+        self.by_pair.setdefault(pair, set()).add(index)
+        self.links[index] = {peer for peer in PEERS[index] if peer in self.links}
+        for peer in self.links[index]:
+            self.links[peer].add(index)
+
+    def remove(self, index: int, pair: int) -> None:
+        group = self.by_pair[pair]
+        group.discard(index)
+        if not group:
+            del self.by_pair[pair]
+        for peer in self.links.pop(index):
+            self.links[peer].discard(index)
+
+    def cells(self) -> list[int]:
+        """Return the indices of every bivalue cell in order."""
+        return sorted(self.links)
+
+    def with_pair(self, pair: int) -> list[int]:
+        """Return the indices of the bivalue cells whose mask is pair, in order."""
+        return sorted(self.by_pair.get(pair, ()))
+
+    def pairs(self) -> list[int]:
+        """Return each candidate mask held by at least one bivalue cell."""
+        return sorted(self.by_pair)
+
+    def peers(self, index: int) -> set[int]:
+        """Return the indices of the bivalue cells seen by the cell at index."""
+        return self.links[index]
+
+    def coloured_chains(self, pair: int) -> list[tuple[int, int]]:
+        """
+        Return each group of connected bivalue cells whose mask is pair
+        as two boards (c.f. src.Bitboard) of alternating colours, so
+        that cells which see each other have different colours. Groups
+        which cannot be coloured that way are left out.
+        """
+        group = self.by_pair.get(pair, set())
+        return two_colour({index: self.links[index] & group for index in group})
@@ -0,0 +1,98 @@
+"""
+The candidates of one sudoku as an (81, 9) NumPy array.
+
+Row i of the array holds the options of the cell at index i (c.f.
+src.Bitboard), with column d - 1 set if the cell could be digit d. The
+array is kept up to date as cells are filled, emptied and lose options
+(c.f. Cell.fill and Cell.remove), so filling a cell clears its digit
+from its twenty peers with one write through PEER_INDEX, and counting
+each digit's places per house and finding hidden singles are a few
+reductions over the array as it stands.
+
+NumPy is optional, as in src.Batch: Sudoku only imports this module
+when asked to (c.f. Sudoku.use_numpy).
+"""
+import numpy as np
+
+from src.Bitboard import CELL_HOUSES, HOUSES, PEERS, digits_mask
+
+HOUSE_INDEX = np.array(HOUSES, dtype=np.intp)
+PEER_INDEX = np.array(PEERS, dtype=np.intp)
+CELL_HOUSE_INDEX = np.array(CELL_HOUSES, dtype=np.intp)
+# Which cells are in each house, and which houses each cell is in, for
+# counting with matrix products.
+HOUSE_CELLS = np.zeros((len(HOUSES), 81), dtype=np.float32)
+HOUSE_CELLS[np.arange(len(HOUSES))[:, None], HOUSE_INDEX] = 1
+CELL_HOUSE_MATRIX = HOUSE_CELLS.T.copy()
+BITS = (1 << np.arange(9)).astype(np.int16)
+# The row of options of each candidate mask.
+MASK_OPTIONS = (np.arange(512)[:, None] >> np.arange(9)) & 1 == 1
+
+
+class CandidateTensor:
+    """
+    The digits and options of a sudoku's cells, as an (81,) array of
+    digits (0 for empty cells) and an (81, 9) boolean array of options.
+
+    The cells' pencil mark sets are still what the rest of the package
+    reads, so the digits filled since the last update_pencil_marks() are
+    kept to be cleared from their peers' sets then.
+    """
+
+    def __init__(self, sudoku) -> None:
+        self.cells = list(sudoku)
+        self.digits = np.array(sudoku.digits(), dtype=np.uint8)
+        self.options = MASK_OPTIONS[sudoku.candidate_masks()]
+        self.filled: list[tuple[int, int]] = []
+
+    def fill(self, index: int, digit: int) -> None:
+        """Fill the cell at index with digit and clear digit from its peers' options."""
+        self.digits[index] = digit
+        self.options[index] = False
+        self.options[PEER_INDEX[index], digit - 1] = False
+        self.filled.append((index, digit))
+
+    def empty(self, index: int, pencil_marks: set[int]) -> None:
+        """Empty the cell at index, leaving it the options in pencil_marks."""
+        self.digits[index] = 0
+        self.options[index] = MASK_OPTIONS[digits_mask(pencil_marks)]
+
+    def remove(self, index: int, digits: set[int]) -> None:
+        """Remove digits from the options of the cell at index."""
+        self.options[index] &= ~MASK_OPTIONS[digits_mask(digits)]
+
+    def update_pencil_marks(self) -> None:
+        """
+        Clear each digit filled since the last call from its peers'
+        pencil marks, as the array already has, and clear the pencil
+        marks of the cells it was filled in.
+        """
+        cells = self.cells
+        for index, digit in self.filled:
+            for peer in PEERS[index]:
+                cells[peer].pencil_marks.discard(digit)
+            if not cells[index].is_empty:
+                cells[index].pencil_marks = set()
+        self.filled.clear()
+
+    def masks(self) -> list[int]:
+        """Return the candidate mask (c.f. src.Bitboard) of each cell, 0 for filled cells."""
+        return (self.options @ BITS).tolist()
+
+    def house_counts(self) -> "np.ndarray":
+        """Return a (27, 9) array of the number of places for each digit in each house."""
+        return (HOUSE_CELLS @ self.options).astype(np.uint8)
+
+    def hidden_single(self) -> tuple[int, int] | None:
+        """
+        Return (index, digit) for the first option, in order of index
+        and then digit, which is the only place for its digit in one of
+        its cell's houses, or None if there are none.
+        """
+        unique = self.house_counts() == 1
+        found = self.options & (CELL_HOUSE_MATRIX @ unique > 0)
+        first = int(found.argmax())
+        if not found.flat[first]:
+            return None
+        index, digit = divmod(first, 9)
+        return index, digit + 1
@@ -42,6 +42,9 @@ class Cell:
         self.digit: int | str = digit
         self.pencil_marks: set[int] = {i for i in range(1, 10)}
         self.started_empty: bool = True
+        # Set by Sudoku.use_numpy(): a src.CandidateTensor which fill(),
+        # clear() and remove() keep up to date.
+        self.tensor = None
 
     def __repr__(self) -> str:
         return f"Cell({self.coordinates}: {self.digit})"
@@ -125,6 +128,11 @@ class Cell:
             if self.coordinates in box:
                 return key
 
+    @property
+    def index(self) -> int:
+        """Return this cell's index in CELL_KEYS order."""
+        return 9 * self.y + self.x
+
     @property
     def row_num(self) -> int:
         """Return this cell's ordinal row number."""
@@ -139,21 +147,29 @@ class Cell:
         """Fill the cell with digit and updates pencil_marks."""
         if digit == " ":
             self.digit: str = digit
+            if self.tensor is not None:
+                self.tensor.empty(self.index, self.pencil_marks)
             return
         digit = int(digit)
         if digit == 0:
             self.digit: str = " "
+            if self.tensor is not None:
+                self.tensor.empty(self.index, self.pencil_marks)
         else:
             if digit <= 0 or digit >= 10:
                 raise ValueError(f"{digit} must be between 1 and 9 (inclusive).")
             self.digit: int = digit
             self.pencil_marks: set = {digit}
+            if self.tensor is not None:
+                self.tensor.fill(self.index, digit)
         return
 
     def clear(self) -> None:
         """Empty the cell."""
         self.digit = " "
         self.pencil_marks = {i for i in range(1, 10)}
+        if self.tensor is not None:
+            self.tensor.empty(self.index, self.pencil_marks)
         return
 
     def has_same_options_as(self, other: "Cell") -> bool:
@@ -193,8 +209,11 @@ class Cell:
         return True if a change was made, and False if not."""
         if type(pencil_marks) in (list, tuple, int):
             pencil_marks = {pencil_marks}
-        if self.pencil_marks.intersection(pencil_marks):
-            self.pencil_marks -= pencil_marks
+        removed = self.pencil_marks.intersection(pencil_marks)
+        if removed:
+            self.pencil_marks -= removed
+            if self.tensor is not None:
+                self.tensor.remove(self.index, removed)
             return True
         return False
 
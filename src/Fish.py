@@ -0,0 +1,240 @@
+"""
+Fish patterns on a single digit, found with bitmasks.
+
+A fish of size n has n base houses and n cover houses which between
+them contain every place for the digit in the base houses. The digit
+appears once in each base house and at most once in each cover house,
+so the n digits in the base houses fill every cover house and the digit
+can be removed from the rest of the cover houses.
+
+Places for the digit in the base houses which are not in any cover
+house are fins. If there are fins, one of them may hold the digit
+instead, so only places which also see every fin can be removed. A
+sashimi fish is a finned fish in which a base house has fewer than two
+places left once its fins are taken away.
+
+X-wings, swordfish and jellyfish use rows as base houses and columns
+as cover houses or the other way around. Franken fish also use boxes.
+
+Each digit's places are given as a board (c.f. src.Bitboard), such as
+one of the planes returned by src.Bitboard.digit_planes(). Fish which
+can't remove anything are never yielded.
+"""
+from itertools import combinations
+from typing import Generator
+
+from src.Bitboard import CELL_HOUSES, HOUSE_BOARDS, seen_by_all
+
+# Offsets of the first house of each kind in src.Bitboard.HOUSES.
+HOUSE_OFFSETS = {"row": 0, "column": 9, "box": 18}
+PERPENDICULAR = {"row": "column", "column": "row"}
+# Fish without fins, with fins, and sashimi fish, in the order the
+# solver looks for them.
+VARIANTS = "basic", "finned", "sashimi"
+
+
+def line_masks(plane: int, kind: str) -> list[int]:
+    """
+    Return the nine 9-bit position masks of plane for rows or columns.
+    Bit i of the mask for row y is set if the cell in column i of the
+    row is in plane, and likewise with rows for columns.
+    """
+    if kind == "row":
+        return [plane >> (9 * y) & 0x1FF for y in range(9)]
+    masks = [0] * 9
+    for y in range(9):
+        row = plane >> (9 * y) & 0x1FF
+        while row:
+            low = row & -row
+            masks[low.bit_length() - 1] |= 1 << y
+            row ^= low
+    return masks
+
+
+# The board of every row, and of every column, whose bit is set in each
+# of the 512 9-bit line masks.
+LINE_BOARDS: dict = {
+    kind: tuple(sum(HOUSE_BOARDS[HOUSE_OFFSETS[kind] + i] for i in range(9) if lines >> i & 1) for lines in range(512))
+    for kind in PERPENDICULAR
+}
+
+
+def base_lines(masks: list[int], size: int, max_width: int,
+               start: int = 0, lines: int = 0, union: int = 0) -> Generator[tuple[int, int], None, None]:
+    """
+    Yield (lines, union) for each set of size lines which hold the
+    digit, where lines has a bit set for each line and union is the OR
+    of their position masks. Sets whose union is wider than max_width
+    are pruned as soon as they get too wide.
+    """
+    if lines.bit_count() == size:
+        yield lines, union
+        return
+    for i in range(start, 9):
+        if not masks[i]:
+            continue
+        new_union = union | masks[i]
+        if new_union.bit_count() <= max_width:
+            yield from base_lines(masks, size, max_width, i + 1, lines | 1 << i, new_union)
+
+
+def fish_variant(houses: list[int], cover: int, fins: int) -> str:
+    """
+    Return which of VARIANTS a fish is, given the places in each of its
+    base houses and its cover and fins boards.
+    """
+    if not fins:
+        return "basic"
+    if any((cells & cover).bit_count() < 2 for cells in houses):
+        return "sashimi"
+    return "finned"
+
+
+def find_line_fish(plane: int, size: int, kind: str = "row",
+                   variant: str = "basic") -> Generator[tuple[int, int, int], None, None]:
+    """
+    Yield (base, cover, fins) boards for the x-wings (size 2),
+    swordfish (size 3) or jellyfish (size 4) of the given variant in
+    plane with kind ("row" or "column") as their base houses.
+    """
+    for found, base, cover, fins in line_fish(plane, size, kind, variant != "basic"):
+        if found == variant:
+            yield base, cover, fins
+
+
+def line_fish(plane: int, size: int, kind: str, finned: bool) -> Generator[tuple[str, int, int, int], None, None]:
+    """
+    Yield (variant, base, cover, fins) for the line fish of size in
+    plane (c.f. find_line_fish), leaving out finned and sashimi fish
+    unless finned is True.
+    """
+    masks = line_masks(plane, kind)
+    boards = LINE_BOARDS[kind]
+    perpendicular = LINE_BOARDS[PERPENDICULAR[kind]]
+    # Fins must share a box with a cover line to eliminate anything,
+    # so at most two lines beyond the cover lines can hold them.
+    max_width = size + 2 if finned else size
+    for lines, union in base_lines(masks, size, max_width):
+        if union.bit_count() < size:
+            continue
+        houses = [boards[1 << i] & plane for i in range(9) if lines >> i & 1]
+        base = boards[lines] & plane
+        positions = [1 << i for i in range(9) if union >> i & 1]
+        for chosen in combinations(positions, size):
+            cover = perpendicular[sum(chosen)]
+            targets = plane & cover & ~base
+            fins = base & ~cover
+            if fins:
+                # Cells outside the base lines which see every fin are
+                # in the fins' box, so fins spread over boxes see none.
+                box = HOUSE_BOARDS[CELL_HOUSES[(fins & -fins).bit_length() - 1][2]]
+                if fins & ~box:
+                    continue
+                targets &= box
+            if not targets:
+                continue
+            yield fish_variant(houses, cover, fins), base, cover, fins
+
+
+def find_franken_fish(plane: int, size: int, kind: str = "row",
+                      variant: str = "basic") -> Generator[tuple[int, int, int], None, None]:
+    """
+    Yield (base, cover, fins) boards for the fish of the given variant
+    in plane whose base houses are rows or columns, per kind, and at
+    least one box, and whose cover houses are the perpendicular lines
+    and boxes.
+    """
+    for found, base, cover, fins in franken_fish(plane, size, kind, variant != "basic"):
+        if found == variant:
+            yield base, cover, fins
+
+
+def franken_fish(plane: int, size: int, kind: str, finned: bool) -> Generator[tuple[str, int, int, int], None, None]:
+    """
+    Yield (variant, base, cover, fins) for the franken fish of size in
+    plane (c.f. find_franken_fish), leaving out finned and sashimi
+    fish unless finned is True.
+    """
+    base_offset = HOUSE_OFFSETS[kind]
+    cover_offset = HOUSE_OFFSETS[PERPENDICULAR[kind]]
+    base_houses = [h for h in [*range(base_offset, base_offset + 9), *range(18, 27)]
+                   if HOUSE_BOARDS[h] & plane]
+    cover_houses = {*range(cover_offset, cover_offset + 9), *range(18, 27)}
+    for chosen in combinations(base_houses, size):
+        if chosen[-1] < 18:
+            continue
+        houses = [HOUSE_BOARDS[house] & plane for house in chosen]
+        base = 0
+        for cells in houses:
+            if base & cells:
+                break
+            base |= cells
+        else:
+            for cover, fins in cover_sets(plane, base, cover_houses - set(chosen), size, finned):
+                if fish_eliminations(plane, base, cover, fins):
+                    yield fish_variant(houses, cover, fins), base, cover, fins
+
+
+def cover_sets(plane: int, base: int, cover_houses: set[int], size: int,
+               finned: bool) -> Generator[tuple[int, int], None, None]:
+    """
+    Yield (cover, fins) for each way to cover the cells of base with
+    size of cover_houses, leaving the cells in fins uncovered. Fins are
+    only left if finned is True and some place in plane outside base
+    sees all of them.
+    """
+    # Each entry is (uncovered cells, houses used, cover, fins).
+    stack = [(base, 0, 0, 0)]
+    while stack:
+        uncovered, used, cover, fins = stack.pop()
+        if not uncovered:
+            if used == size:
+                yield cover, fins & ~cover
+            continue
+        low = uncovered & -uncovered
+        if finned and seen_by_all(fins | low) & plane & ~base:
+            stack.append((uncovered ^ low, used, cover, fins | low))
+        if used < size:
+            for house in CELL_HOUSES[low.bit_length() - 1]:
+                if house in cover_houses:
+                    board = HOUSE_BOARDS[house]
+                    stack.append((uncovered & ~board, used + 1, cover | board, fins))
+
+
+def find_fish(plane: int, size: int, kind: str = "row", variant: str = "basic",
+              franken: bool = False) -> Generator[tuple[int, int, int], None, None]:
+    """
+    Yield the fish of size and variant in plane with rows or columns,
+    per kind, as base houses, followed by franken fish if franken is
+    True.
+    """
+    yield from find_line_fish(plane, size, kind, variant)
+    if franken:
+        yield from find_franken_fish(plane, size, kind, variant)
+
+
+def fish_by_variant(plane: int, size: int, kind: str = "row",
+                    franken: bool = False) -> dict[str, list[tuple[int, int, int]]]:
+    """
+    Return the fish of size in plane that find_fish() yields for each
+    of VARIANTS, searching only once for all of them.
+    """
+    found = {variant: [] for variant in VARIANTS}
+    for variant, *fish in line_fish(plane, size, kind, True):
+        found[variant].append(tuple(fish))
+    if franken:
+        for variant, *fish in franken_fish(plane, size, kind, True):
+            if tuple(fish) not in found[variant]:
+                found[variant].append(tuple(fish))
+    return found
+
+
+def fish_eliminations(plane: int, base: int, cover: int, fins: int) -> int:
+    """
+    Return the board of places in plane which the fish with the given
+    base, cover and fins boards removes the digit from.
+    """
+    targets = plane & cover & ~base
+    if not fins or not targets:
+        return targets
+    return targets & seen_by_all(fins)
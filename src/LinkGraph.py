@@ -0,0 +1,216 @@
+from typing import Generator, Iterable, Optional
+
+from src.Bitboard import CELL_HOUSES, HOUSES, PEERS
+
+
+def node(index: int, digit: int) -> int:
+    """Return the node for digit as a candidate in the cell at index."""
+    return 9 * index + digit - 1
+
+
+def node_index(n: int) -> int:
+    """Return the index of the cell a node belongs to."""
+    return n // 9
+
+
+def node_digit(n: int) -> int:
+    """Return the digit a node stands for."""
+    return n % 9 + 1
+
+
+def two_colour(links: dict[int, Iterable[int]]) -> list[tuple[int, int]]:
+    """
+    Split the graph in which each key of links is joined to each of its
+    values into connected components, and return each as a pair of
+    boards (c.f. src.Bitboard) in which no two joined cells share a
+    board. Components with odd cycles, which cannot be split that way,
+    are left out. Cycles of even length are coloured like any other
+    component.
+    """
+    components = []
+    colours = {}
+    for start in sorted(links):
+        if start in colours:
+            continue
+        colours[start] = 0
+        boards = [1 << start, 0]
+        queue = [start]
+        consistent = True
+        for index in queue:
+            colour = colours[index]
+            for linked in links[index]:
+                if linked not in colours:
+                    colours[linked] = 1 - colour
+                    boards[1 - colour] |= 1 << linked
+                    queue.append(linked)
+                elif colours[linked] == colour:
+                    consistent = False
+        if consistent:
+            components.append((boards[0], boards[1]))
+    return components
+
+
+class LinkGraph:
+    """
+    The strong and weak links between the candidates of a sudoku.
+
+    Each candidate is a node (c.f. node()). Two nodes are strongly
+    linked if at least one of them must be true: they are the only two
+    places for a digit in a house, or the only two options in a cell.
+    Two nodes are weakly linked if at most one of them can be true:
+    they are the same digit in cells that see each other, or different
+    digits in the same cell.
+
+    The graph keeps the candidate masks (c.f. src.Bitboard) and digit
+    planes it was last updated with and an index of the strongly linked
+    pair, if any, for every house and digit, also grouped by digit (c.f.
+    strong_houses). Calling update() re-indexes only the houses whose
+    versions (c.f. Sudoku.update_versions) have changed since then, and
+    forgets the colourings (c.f. colour_components()) of digits whose
+    versions have changed.
+    """
+
+    def __init__(self) -> None:
+        self.masks: list[int] = [0] * 81
+        self.planes: list[int] = [0] * 9
+        self.house_versions: list[int] = [-1] * len(HOUSES)
+        self.digit_versions: list[int] = [-1] * 9
+        self.conjugates: list[list[tuple[int, int] | None]] = [[None] * 9 for _ in HOUSES]
+        self.strong_houses: list[dict[int, tuple[int, int]]] = [{} for _ in range(9)]
+        self.colourings: list[Optional[list[tuple[int, int]]]] = [None] * 9
+
+    def update(self, sudoku) -> None:
+        """Bring the graph up to date with sudoku (c.f. Sudoku.updated)."""
+        self.masks = sudoku.masks
+        self.planes = sudoku.planes
+        for house in sudoku.changed_houses(self.house_versions):
+            for digit in range(1, 10):
+                self.index_conjugate(house, digit)
+        for d, (old, new) in enumerate(zip(self.digit_versions, sudoku.digit_versions)):
+            if old != new:
+                self.colourings[d] = None
+        self.house_versions[:] = sudoku.house_versions
+        self.digit_versions[:] = sudoku.digit_versions
+
+    def index_conjugate(self, house: int, digit: int) -> None:
+        bit = 1 << (digit - 1)
+        places = tuple(index for index in HOUSES[house] if self.masks[index] & bit)
+        if len(places) == 2:
+            self.conjugates[house][digit - 1] = places
+            self.strong_houses[digit - 1][house] = places
+        else:
+            self.conjugates[house][digit - 1] = None
+            self.strong_houses[digit - 1].pop(house, None)
+
+    def conjugate_pairs(self, digit: int) -> set[tuple[int, int]]:
+        """
+        Return a set of pairs of cell indices which are the only two
+        places for digit in some house.
+        """
+        return set(self.strong_houses[digit - 1].values())
+
+    def conjugate_houses(self, digit: int) -> list[tuple[int, tuple[int, int]]]:
+        """
+        Return (house, pair) for each house in which the only two places
+        for digit are the cell indices in pair, in order of house.
+        """
+        return sorted(self.strong_houses[digit - 1].items())
+
+    def colour_components(self, digit: int) -> list[tuple[int, int]]:
+        """
+        Return the groups of cells joined by conjugate pairs on digit,
+        each split into two colours (c.f. two_colour()). Exactly one
+        colour of each group holds the digit.
+        """
+        if self.colourings[digit - 1] is None:
+            links = {}
+            for a, b in self.conjugate_pairs(digit):
+                links.setdefault(a, set()).add(b)
+                links.setdefault(b, set()).add(a)
+            self.colourings[digit - 1] = two_colour(links)
+        return self.colourings[digit - 1]
+
+    def strong_links(self, n: int, kind: str = "aic") -> list[int]:
+        """
+        Return the nodes strongly linked to n. Links between houses are
+        left out for "xy" chains, and links within a cell for "x"
+        chains.
+        """
+        index, digit = node_index(n), node_digit(n)
+        linked = []
+        if kind != "xy":
+            for house in CELL_HOUSES[index]:
+                pair = self.conjugates[house][digit - 1]
+                if pair is not None:
+                    other = pair[1] if pair[0] == index else pair[0]
+                    if (other_node := node(other, digit)) not in linked:
+                        linked.append(other_node)
+        if kind != "x":
+            mask = self.masks[index]
+            if mask.bit_count() == 2:
+                other_digit = (mask ^ (1 << (digit - 1))).bit_length()
+                linked.append(node(index, other_digit))
+        return linked
+
+    def weak_links(self, n: int, kind: str = "aic") -> list[int]:
+        """
+        Return the nodes weakly linked to n. Only bivalue cells are
+        linked to for "xy" chains, and links within a cell are only
+        included for "aic" chains.
+        """
+        index, digit = node_index(n), node_digit(n)
+        bit = 1 << (digit - 1)
+        masks = self.masks
+        if kind == "xy":
+            linked = [node(peer, digit) for peer in PEERS[index]
+                      if masks[peer] & bit and masks[peer].bit_count() == 2]
+        else:
+            linked = [node(peer, digit) for peer in PEERS[index] if masks[peer] & bit]
+        if kind == "aic":
+            mask = masks[index] ^ bit
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                linked.append(node(index, low.bit_length()))
+        return linked
+
+    def chain_ends(self, start: int, max_length: int, kind: str = "aic") -> Generator[int, None, None]:
+        """
+        Search outwards from start along chains of alternately strong
+        and weak links, beginning with a strong link, and yield each
+        node reached by a strong link. If start is false, then every
+        node yielded is true. No chain longer than max_length links is
+        followed.
+        """
+        off, reached_off = [start], {start}
+        reached_on = set()
+        length = 1
+        while off and length <= max_length:
+            on = []
+            for n in off:
+                for linked in self.strong_links(n, kind):
+                    if linked not in reached_on:
+                        reached_on.add(linked)
+                        on.append(linked)
+                        yield linked
+            length += 2
+            if length > max_length:
+                break
+            off = []
+            for n in on:
+                for linked in self.weak_links(n, kind):
+                    if linked not in reached_off:
+                        reached_off.add(linked)
+                        off.append(linked)
+
+    def eliminations(self, start: int, end: int) -> set[int]:
+        """
+        Return the nodes, other than start and end, which are weakly
+        linked to both. If one of start or end must be true, each of
+        them is false.
+        """
+        start_index, end_index = node_index(start), node_index(end)
+        if node_digit(start) != node_digit(end) and start_index != end_index \
+                and end_index not in PEERS[start_index]:
+            return set()
+        return set(self.weak_links(start)).intersection(self.weak_links(end)) - {start, end}
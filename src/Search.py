@@ -0,0 +1,128 @@
+"""
+Backtracking search over candidate masks (c.f. src.Bitboard).
+
+A grid is a list of 81 candidate masks in which a filled cell is a
+mask with a single bit set. Copying that list is the checkpoint taken
+before each guess, and dropping the copy is the rollback.
+"""
+from src.Bitboard import ALL_DIGITS, HOUSES, PEERS
+
+
+def propagate(masks: list[int], queue: list[int] = None, depth: int = None) -> bool:
+    """
+    Place naked and hidden singles in masks (in place) until none are
+    left. Return False if the grid reaches a contradiction.
+
+    :param masks: 81 candidate masks; modified in place.
+    :param queue: Indices of single-bit cells whose digit has not yet
+        been removed from their peers. Defaults to every single-bit cell.
+    :param depth: If given, stop after this many rounds of placing
+        singles, even if more singles are available.
+    """
+    if queue is None:
+        queue = [i for i, mask in enumerate(masks) if mask and not mask & (mask - 1)]
+    rounds = 0
+    while True:
+        while queue:
+            i = queue.pop()
+            bit = masks[i]
+            for peer in PEERS[i]:
+                peer_mask = masks[peer]
+                if peer_mask & bit:
+                    peer_mask ^= bit
+                    if not peer_mask:
+                        return False
+                    masks[peer] = peer_mask
+                    if not peer_mask & (peer_mask - 1):
+                        queue.append(peer)
+        for house in HOUSES:
+            once = twice = 0
+            for i in house:
+                mask = masks[i]
+                twice |= once & mask
+                once |= mask
+            if once != ALL_DIGITS:
+                return False
+            hidden = once & ~twice
+            if not hidden:
+                continue
+            for i in house:
+                mask = masks[i]
+                found = mask & hidden
+                if found and found != mask:
+                    if found & (found - 1):
+                        return False
+                    masks[i] = found
+                    queue.append(i)
+        rounds += 1
+        if not queue or rounds == depth:
+            return True
+
+
+def try_digit(masks: list[int], index: int, bit: int, depth: int = None) -> list[int] | None:
+    """
+    Return a copy of masks in which cell index is set to bit and singles
+    have been propagated, or None if that leads to a contradiction.
+    """
+    branch = masks.copy()
+    branch[index] = bit
+    if propagate(branch, [index], depth):
+        return branch
+    return None
+
+
+def forced_masks(masks: list[int], branches: list[tuple[int, int]], depth: int = None) -> list[int] | None:
+    """
+    Given a list of (index, bit) assignments of which at least one must
+    be true, return the union of masks over every branch that does not
+    reach a contradiction. A candidate missing from the union is false
+    whichever branch holds. Return None if every branch fails.
+    """
+    union = None
+    for index, bit in branches:
+        branch = try_digit(masks, index, bit, depth)
+        if branch is None:
+            continue
+        if union is None:
+            union = branch
+        else:
+            union = [a | b for a, b in zip(union, branch)]
+    return union
+
+
+def count_solutions(masks: list[int], limit: int = 2) -> int:
+    """
+    Return the number of solutions of the grid described by masks,
+    counting no further than limit.
+    """
+    masks = list(masks)
+    if not propagate(masks):
+        return 0
+    return _count(masks, limit)
+
+
+def _count(masks: list[int], limit: int) -> int:
+    # Branch on the unsolved cell with the fewest candidates.
+    best = -1
+    best_size = 10
+    for i, mask in enumerate(masks):
+        if mask & (mask - 1):
+            size = mask.bit_count()
+            if size < best_size:
+                best, best_size = i, size
+                if size == 2:
+                    break
+    if best == -1:
+        return 1
+
+    count = 0
+    options = masks[best]
+    while options:
+        bit = options & -options
+        options ^= bit
+        branch = try_digit(masks, best, bit)
+        if branch is not None:
+            count += _count(branch, limit - count)
+            if count >= limit:
+                break
+    return count
@@ -0,0 +1,174 @@
+"""
+Set equivalence constraints, found with cell indices (c.f. src.Bitboard).
+
+Two groups of cells are equivalent when, in the solved sudoku, the
+digits in the left group are the digits in the right group plus some
+number of full sets of 1-9, counting repeats. Phistomefel's ring and
+Van De Wetering's squares are both examples, as are the leftover cells
+given by the Law of Leftovers in a jigsaw sudoku.
+
+Once every cell but one in the two groups is filled, the digit the
+empty cell needs to balance the groups is known. If one cell in each
+group is empty, the two digits are still known unless they are equal.
+"""
+from itertools import product
+from typing import Iterable
+
+from src.Bitboard import HOUSES, INDEX
+from src.Sudoku import vdw_index_map, vdw_key_map, vdw_map
+
+
+class SetConstraint:
+    """
+    Two groups of cells, left and right, whose digits are the same once
+    extra full sets of 1-9 are added to right. Cells in both groups
+    cancel out and are dropped from each.
+
+    The constraint keeps a count of each filled digit in its groups,
+    which fill() changes one cell at a time.
+    """
+
+    def __init__(self, left: Iterable[int], right: Iterable[int], extra: int = 0, kind: str = "user") -> None:
+        left, right = set(left), set(right)
+        self.left: tuple[int, ...] = tuple(sorted(left - right))
+        self.right: tuple[int, ...] = tuple(sorted(right - left))
+        self.extra = extra
+        self.kind = kind
+        self.sides: dict[int, int] = {index: 0 for index in self.left} | {index: 1 for index in self.right}
+        # counts[d - 1] is the number of ds filled in left less the
+        # number filled in right, and empty[side] the number of empty
+        # cells in left (0) or right (1).
+        self.counts: list[int] = [0] * 9
+        self.empty: list[int] = [len(self.left), len(self.right)]
+        if len(self.left) != len(self.right) + 9 * extra:
+            raise ValueError(f"{len(self.left)} cells can't match {len(self.right)} cells plus {extra} full sets.")
+
+    def fill(self, index: int, old: int, new: int) -> None:
+        """Replace the digit old in the cell at index with new (0 if empty)."""
+        side = self.sides[index]
+        sign = 1 - 2 * side
+        if old:
+            self.counts[old - 1] -= sign
+        else:
+            self.empty[side] -= 1
+        if new:
+            self.counts[new - 1] += sign
+        else:
+            self.empty[side] += 1
+
+    def placements(self, digits: list[int]) -> list[tuple[int, int]]:
+        """
+        Return the (index, digit) pairs which must be filled in for the
+        groups to balance, given the digit in each cell of the sudoku.
+        """
+        if self.empty[0] + self.empty[1] not in (1, 2) or max(self.empty) > 1:
+            return []
+        # Digits the left group is short of (+1) or has in excess (-1).
+        needed = [self.extra - count for count in self.counts]
+        found = []
+        for side, cells, sign in ((0, self.left, 1), (1, self.right, -1)):
+            if not self.empty[side]:
+                continue
+            wanted = [d for d in range(1, 10) if needed[d - 1] == sign]
+            if len(wanted) == 1:
+                found.extend((index, wanted[0]) for index in cells if not digits[index])
+        return found
+
+
+class SetIndex:
+    """
+    The set equivalence constraints of a sudoku, with the cells they
+    must fill.
+
+    The index keeps the digits and house versions (c.f.
+    Sudoku.update_versions) it was last updated with, and update() only
+    looks again at constraints with a cell in a house which has changed
+    since then.
+    """
+
+    def __init__(self, constraints: Iterable[SetConstraint] = ()) -> None:
+        self.digits: list[int] = [0] * 81
+        self.house_versions: list[int] = [-1] * len(HOUSES)
+        self.constraints: list[SetConstraint] = []
+        self.cell_constraints: list[list[int]] = [[] for _ in range(81)]
+        self.found: list[list[tuple[int, int]]] = []
+        for constraint in constraints:
+            self.add(constraint)
+
+    def add(self, constraint: SetConstraint) -> None:
+        """Add constraint to the index, counting the digits already filled in."""
+        number = len(self.constraints)
+        self.constraints.append(constraint)
+        for index in constraint.sides:
+            self.cell_constraints[index].append(number)
+            if self.digits[index]:
+                constraint.fill(index, 0, self.digits[index])
+        self.found.append(constraint.placements(self.digits))
+
+    def update(self, sudoku) -> None:
+        """Bring the index up to date with sudoku (c.f. Sudoku.updated)."""
+        houses = sudoku.changed_houses(self.house_versions)
+        self.house_versions[:] = sudoku.house_versions
+        if not houses:
+            return
+        digits = sudoku.digits()
+        changed = set()
+        for index in {index for house in houses for index in HOUSES[house]}:
+            old, new = self.digits[index], digits[index]
+            if old != new:
+                for number in self.cell_constraints[index]:
+                    self.constraints[number].fill(index, old, new)
+                changed.update(self.cell_constraints[index])
+        self.digits = digits
+        for number in changed:
+            self.found[number] = self.constraints[number].placements(self.digits)
+
+    def placements(self, kind: str) -> list[tuple[int, int]]:
+        """Return the cells which constraints of kind must fill, as (index, digit) pairs."""
+        return [placement
+                for number, constraint in enumerate(self.constraints) if constraint.kind == kind
+                for placement in self.found[number]]
+
+
+def phistomefel_groups(left_col: int, right_col: int, top_row: int,
+                       bot_row: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """
+    Return the indices of the corners of the grid and of the ring
+    around the centre box for the given lines, c.f.
+    Sudoku.single_phistomefel_set.
+    """
+    corners = [
+        (x, y) for y, x in product(range(9), repeat=2)
+        if x not in range(3, 6) and y not in range(3, 6)
+        and x not in (left_col, right_col) and y not in (top_row, bot_row)
+    ]
+    ring = [(x, y) for x in range(3, 6) for y in (top_row, bot_row)]
+    ring += [(x, y) for x in (left_col, right_col) for y in range(3, 6)]
+    ring += [(x, y) for x in (left_col, right_col) for y in (top_row, bot_row)]
+    return tuple(sorted(map(INDEX.get, corners))), tuple(sorted(map(INDEX.get, ring)))
+
+
+def van_de_wetering_groups(vertical: str, horizontal: str) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """
+    Return the indices of the large and small squares for the given
+    corner, c.f. Sudoku.single_vdw_square.
+    """
+    parity = vdw_map[vertical]["parity"] * vdw_map[horizontal]["parity"]
+    diagonal_keys = vdw_key_map[parity]
+    major = vdw_index_map[parity]
+    large = [(4, 4), *vdw_map[vertical]["keys"], *vdw_map[horizontal]["keys"], *diagonal_keys[major]]
+    return tuple(sorted(map(INDEX.get, large))), tuple(sorted(map(INDEX.get, diagonal_keys[1 - major])))
+
+
+# (left, right) index groups for each of the 81 Phistomefel rings,
+# whose two groups hold the same digits, and each of the four Van De
+# Wetering squares, whose left group holds one full set more than its
+# right.
+PHISTOMEFEL = tuple(phistomefel_groups(*lines) for lines in product(range(3), range(6, 9), range(3), range(6, 9)))
+VAN_DE_WETERING = tuple(van_de_wetering_groups(*corner) for corner in product(("top", "bottom"), ("left", "right")))
+
+
+def standard_constraints() -> list[SetConstraint]:
+    """Return a new constraint for each Phistomefel ring and Van De Wetering square."""
+    return [SetConstraint(left, right, 0, "phistomefel") for left, right in PHISTOMEFEL] + \
+        [SetConstraint(left, right, 1, "van de wetering") for left, right in VAN_DE_WETERING]
@@ -1,42 +1,32 @@
 from collections.abc import Iterable
-from copy import deepcopy, copy
+from copy import copy
 from itertools import combinations, product
-from typing import Optional, Generator, Any
-
+from time import perf_counter
+from typing import Any, Callable, Generator, Hashable, Optional
+
+from src import Fish, Search, Template, UniqueRectangle
+from src.ALSIndex import ALSIndex
+from src.Bitboard import ALL_DIGITS, CELL_HOUSES, CELL_RECTANGLES, HOUSE_BOARDS, HOUSES, KEYS, MINI_LINES, \
+    PEER_BOARDS, PEERS, RECTANGLES, board_indices, digit_bit, empty_rectangle_lines, mask_digits, \
+    seen_by_all, seen_by_any
 from src.Cell import Cell
+from src.LinkGraph import LinkGraph, node, node_digit, node_index
+from src.SetEquivalence import SetIndex, standard_constraints
+from src.SubsetIndex import MAX_TUPLE_SIZE, SubsetIndex
 from src.Sudoku import Sudoku
+from src.UniqueRectangle import RectangleIndex
 
-RC_ITER = "rows", "columns"
 RC = "row", "column"
-RCB_ITER = tuple(RC_ITER + ("boxes",))
-RCB = tuple(RC + ("box",))
-
-LITERALS = {
-    "row": {
-        "iter_house": "rows",
-        "single_house": "row",
-        "check_axis": "y",
-        "opposite_iter_house": "columns",
-        "opposite_house": "column",
-        "opposite_axis": "x",
-    },
-    "column": {
-        "iter_house": "columns",
-        "single_house": "column",
-        "check_axis": "x",
-        "opposite_iter_house": "rows",
-        "opposite_house": "row",
-        "opposite_axis": "y"
-    },
-    "box": {
-        "iter_house": "boxes",
-        "single_house": "box",
-        "check_axis": "box_num",
-        "opposite_iter_house": None,
-        "opposite_house": None,
-        "opposite_axis": None
-    }
-}
+
+# Rounds of singles followed from each assumption, and seconds allowed
+# per forcing strategy in a single step.
+FORCING_DEPTH = 12
+FORCING_TIME_BUDGET = 0.5
+# Whether fish may use boxes as base and cover houses. Searching for
+# franken fish is much slower than for fish on rows and columns alone.
+FRANKEN_FISH = False
+# Longest chain, in links, followed by the chain strategies.
+CHAIN_LENGTH = 11
 
 
 class Solver:
@@ -44,6 +34,19 @@ class Solver:
         sudoku.update_pencil_marks()
         self.sudoku = sudoku
         self.is_solved = self.sudoku.is_complete
+        self.link_graph = LinkGraph()
+        self.als_index = ALSIndex()
+        self.subset_index = SubsetIndex()
+        self.rectangle_index = RectangleIndex()
+        self.set_index = SetIndex(standard_constraints())
+        # Scratch space for fill_hidden_singles(): the candidate mask of
+        # the digits with one place left in each house.
+        self.unique_digits: list[int] = [0] * len(HOUSES)
+        # The places and placements of each digit as of the last call to
+        # surviving_templates(), and the templates which survived them.
+        self.templates: list[Optional[tuple[int, int, list[int]]]] = [None] * 9
+        # (key, digit): (version, value), c.f. cached().
+        self.digit_cache: dict[tuple[Hashable, int], tuple[Hashable, Any]] = {}
 
         basic = {
             "Naked Single": self.fill_naked_singles,
@@ -60,9 +63,12 @@ class Solver:
         }
         hard = {
             "Y-Wing": self.check_for_ywing,
+            "W-Wing": self.check_for_wwing,
+            "Remote Pair": self.check_for_remote_pair,
             "Avoidable Rectangle": self.check_for_avoidable_rectangle
         }
         brutal = {
+            "BUG+1": self.check_for_bug_plus_one,
             "XYZ-Wing": self.check_for_xyzwings,
             "Unique Rectangle": self.check_for_unique_rectangle,
             "Pointing Rectangle": self.check_for_pointing_rectangle,
@@ -70,12 +76,30 @@ class Solver:
         }
         galaxy = {
             "Skyscraper": self.check_for_skyscraper,
+            "2-String Kite": self.check_for_two_string_kite,
+            "Turbot Fish": self.check_for_turbot_fish,
             "Colour Chain": self.check_for_two_colour_logic,
-            "Empty Rectangle": self.check_for_empty_rectangle
+            "Empty Rectangle": self.check_for_empty_rectangle,
+            "Pattern Overlay": self.check_for_pattern_overlay
         }
         set_logic = {
             "Phistomefel Single": self.check_for_phistomefel_singles,
-            "Van De Wetering Square Single": self.check_for_vdw_square_singles
+            "Van De Wetering Square Single": self.check_for_vdw_square_singles,
+            "Set Equivalence Single": self.check_for_set_equivalence_singles
+        }
+        chain = {
+            "X-Chain": self.check_for_x_chain,
+            "XY-Chain": self.check_for_xy_chain,
+            "Alternating Inference Chain": self.check_for_aic
+        }
+        almost_locked_sets = {
+            "ALS-XZ": self.check_for_als_xz,
+            "ALS-XY-Wing": self.check_for_als_xy_wing
+        }
+        forcing = {
+            "Nishio": self.check_for_nishio,
+            "Cell Forcing Chain": self.check_for_cell_forcing_chain,
+            "Unit Forcing Chain": self.check_for_unit_forcing_chain
         }
 
         self.levels = {
@@ -85,7 +109,10 @@ class Solver:
             "hard": hard,
             "brutal": brutal,
             "galaxy": galaxy,
-            "set": set_logic
+            "set": set_logic,
+            "chain": chain,
+            "als": almost_locked_sets,
+            "forcing": forcing
         }
 
     # Super-methods
@@ -135,14 +162,126 @@ class Solver:
         """
         Fill cells that contain a unique pencil mark in a house.
         """
-        for cell in self.sudoku:
-            for digit, house_type in product(cell.pencil_marks, RCB):
-                axis = LITERALS[house_type]["check_axis"]
-                house = getattr(self.sudoku, house_type)(getattr(cell, axis))
-                if len({cell for cell in house if digit in cell}) == 1:
-                    cell.fill(digit)
-                    self.sudoku.update_pencil_marks()
-                    return True
+        tensor = self.sudoku.tensor
+        single = self.hidden_single() if tensor is None else tensor.hidden_single()
+        if single is None:
+            return False
+        index, digit = single
+        self.sudoku[KEYS[index]].fill(digit)
+        self.sudoku.update_pencil_marks()
+        return True
+
+    def hidden_single(self) -> Optional[tuple[int, int]]:
+        """
+        Return (index, digit) for the first pencil mark, in order of
+        index and then digit, which is the only place for its digit in
+        one of its cell's houses, or None if there are none.
+        """
+        masks = self.sudoku.candidate_masks()
+        unique = self.unique_digits
+        for house, cells in enumerate(HOUSES):
+            once = twice = 0
+            for index in cells:
+                twice |= once & masks[index]
+                once |= masks[index]
+            unique[house] = once & ~twice
+        for index, mask in enumerate(masks):
+            row, column, box = CELL_HOUSES[index]
+            found = mask & (unique[row] | unique[column] | unique[box])
+            if found:
+                return index, (found & -found).bit_length()
+        return None
+
+    def fill_set_singles(self, kind: str) -> bool:
+        """
+        Fill a cell which a set equivalence constraint of kind (c.f.
+        src.SetEquivalence) needs to balance its groups.
+        """
+        for index, digit in self.sudoku.updated(self.set_index).placements(kind):
+            cell = self.sudoku[KEYS[index]]
+            if digit in cell.pencil_marks:
+                cell.fill(digit)
+                self.sudoku.update_pencil_marks()
+                return True
+        return False
+
+    def cached(self, key: Hashable, digit: int, build: Callable[[], Any], version: Hashable = None) -> Any:
+        """
+        Return what build() returns for digit, reusing the value kept
+        under key by an earlier call unless version has changed since.
+        By default, version is the version of digit (c.f.
+        Sudoku.update_versions).
+        """
+        if version is None:
+            version = self.sudoku.digit_versions[digit - 1]
+        entry = self.digit_cache.get((key, digit))
+        if entry is None or entry[0] != version:
+            entry = version, build()
+            self.digit_cache[key, digit] = entry
+        return entry[1]
+
+    def check_for_aic(self) -> bool:
+        """
+        In a chain of candidates which alternate between strong links
+        (at least one of the pair is true) and weak links (at most one
+        of the pair is true), beginning and ending with a strong link,
+        at least one end is true. Any candidate weakly linked to both
+        ends is therefore false.
+        """
+        self.sudoku.updated(self.link_graph)
+        starts = [node(index, digit)
+                  for index, cell in enumerate(self.sudoku) if cell.is_empty
+                  for digit in sorted(cell.pencil_marks)]
+        return self.clear_alternating_chains(starts, "aic")
+
+    def check_for_als_xy_wing(self) -> bool:
+        """
+        If ALS A and ALS B (c.f. check_for_als_xz) each have a
+        restricted common digit with ALS C, x and y respectively, then
+        C can't lose both x and y, so one of A and B is locked. Any
+        other digit z shared by A and B must be in one of them, so
+        cells which see every z in both cannot contain z.
+        """
+        index = self.sudoku.updated(self.als_index)
+        sets = index.almost_locked_sets()
+        linked: list[list[tuple[int, int]]] = [[] for _ in sets]
+        for i, j in combinations(range(len(sets)), r=2):
+            if restricted := index.restricted_commons(sets[i], sets[j]):
+                linked[i].append((j, restricted))
+                linked[j].append((i, restricted))
+        for wings in linked:
+            for (a, a_restricted), (b, b_restricted) in combinations(wings, r=2):
+                shared = sets[a][1] & sets[b][1]
+                while shared:
+                    z = shared & -shared
+                    shared ^= z
+                    x_options = a_restricted & ~z
+                    y_options = b_restricted & ~z
+                    if not x_options or not y_options or (x_options | y_options).bit_count() < 2:
+                        continue
+                    if self.clear_candidates(index.shared_digit_eliminations(z, sets[a], sets[b])):
+                        return True
+        return False
+
+    def check_for_als_xz(self) -> bool:
+        """
+        An almost locked set (ALS) is n cells in a house with n + 1
+        options between them. If two ALSs share a restricted common
+        digit x, one which every cell in either that can be x sees,
+        then at most one of them contains x and the other is locked.
+        Any other digit z they share must then be in one of them, so
+        cells which see every z in both cannot contain z.
+        """
+        index = self.sudoku.updated(self.als_index)
+        for a, b in combinations(index.almost_locked_sets(), r=2):
+            restricted = index.restricted_commons(a, b)
+            if not restricted:
+                continue
+            shared = a[1] & b[1]
+            if restricted.bit_count() == 1:
+                shared &= ~restricted
+            if self.clear_candidates(index.shared_digit_eliminations(shared, a, b)):
+                return True
         return False
 
     def check_for_avoidable_rectangle(self) -> bool:
@@ -150,11 +289,73 @@ class Solver:
         Rectangles of cells that started empty and have 3 digits filled
         cannot contain identical digits across both diagonals.
         """
-        for rectangle in self.potential_avoidable_rectangles():
-            if self.clear_avoidable_rectangle(*rectangle):
+        givens = sum(1 << index for index, cell in enumerate(self.sudoku) if not cell.started_empty)
+        masks = self.sudoku.candidate_masks()
+        for candidates in UniqueRectangle.avoidable_eliminations(masks, self.sudoku.grid_masks(), givens):
+            if self.clear_candidates(candidates):
                 return True
         return False
 
+    def check_for_bug_plus_one(self) -> bool:
+        """
+        If every empty cell has two options apart from one which has
+        three, and each option appears twice in every house apart from
+        one digit which appears three times in the houses of the cell
+        with three options, then that cell must contain that digit.
+        Otherwise, the sudoku would have more than one solution.
+        """
+        masks = self.sudoku.candidate_masks()
+        trivalue = None
+        for index, mask in enumerate(masks):
+            count = mask.bit_count()
+            if count == 3:
+                if trivalue is not None:
+                    return False
+                trivalue = index
+            elif count != 0 and count != 2:
+                return False
+        if trivalue is None:
+            return False
+
+        extra = masks[trivalue]
+        for house_num, house in enumerate(HOUSES):
+            once = twice = thrice = more = 0
+            for index in house:
+                mask = masks[index]
+                more |= thrice & mask
+                thrice |= twice & mask
+                twice |= once & mask
+                once |= mask
+            if more or once & ~twice:
+                return False
+            if house_num in CELL_HOUSES[trivalue]:
+                if thrice.bit_count() != 1:
+                    return False
+                extra &= thrice
+            elif thrice:
+                return False
+        if extra.bit_count() != 1:
+            return False
+        self.sudoku[KEYS[trivalue]].fill(extra.bit_length())
+        self.sudoku.update_pencil_marks()
+        return True
+
+    def check_for_cell_forcing_chain(self) -> bool:
+        """
+        One of the options in a cell must be its digit, so if following
+        the singles from each option in turn removes a pencil mark from
+        some cell every time, that pencil mark can be removed.
+        """
+        deadline = perf_counter() + FORCING_TIME_BUDGET
+        masks = self.sudoku.grid_masks()
+        for index, cell in self.forcing_cells():
+            branches = [(index, digit_bit(digit)) for digit in cell.pencil_marks]
+            if self.clear_forced_candidates(masks, Search.forced_masks(masks, branches, FORCING_DEPTH)):
+                return True
+            if perf_counter() > deadline:
+                break
+        return False
+
     def check_for_empty_rectangle(self) -> bool:
         """
         If the cells in a house that cannot be a digit form a
@@ -164,19 +365,17 @@ class Solver:
         cell that lies on the other house cannot contain that digit,
         lest that house be unable to contain it at all.
         """
-        for box in self.sudoku.boxes:
-            unfilled_digits = {i for i in range(1, 10)} - {cell.digit for cell in box if not cell.is_empty}
-            for digit in unfilled_digits:
-                cells_without_digit = {cell for cell in box if digit not in cell}
-                if len(cells_without_digit) < 4: continue
-                for quadruple in combinations(cells_without_digit, r=4):
-                    if Sudoku.cells_form_a_rectangle(*quadruple):
-                        relevant_row_num = self.find_empty_rectangle_house("row", quadruple)
-                        relevant_col_num = self.find_empty_rectangle_house("column", quadruple)
-                        target_cell = self.find_empty_rectangle_perp_sc_cell(relevant_row_num, relevant_col_num, digit)
-                        if target_cell is None: continue
-                        if self.remove_digits_from_cells(digit, target_cell):
-                            return True
+        graph = self.sudoku.updated(self.link_graph)
+        planes = self.sudoku.update_versions()
+        found = [self.cached("empty rectangle", digit, lambda: [
+            [self.empty_rectangle_targets(graph, digit, box, row, column) & planes[digit - 1]
+             for row, column in empty_rectangle_lines(planes[digit - 1], box)]
+            for box in range(9)
+        ]) for digit in range(1, 10)]
+        for box, digit in product(range(9), range(1, 10)):
+            for targets in found[digit - 1][box]:
+                if self.clear_candidates((index, digit) for index in board_indices(targets)):
+                    return True
         return False
 
     def check_for_fish(self) -> bool:
@@ -192,23 +391,23 @@ class Solver:
         column not in that row but that are in the box can't contain
         that digit. This includes finned x-wings, finned swordfish, and
         finned jellyfish.
-        :return:
+
+        If FRANKEN_FISH is set, fish may also use boxes as houses.
         """
         sizes = [2, 3, 4]
-        for size, digit, house_type in product(sizes, range(1, 10), RC):
-            fish_candidate_groups = combinations(self.sudoku.houses_with_digit(house_type, digit), r=size)
-            for fish_house_group in fish_candidate_groups:
-                candidates = [[cell for cell in house if digit in cell] for house in fish_house_group]
-                if min([2 <= len(candidate) <= size + 2 for candidate in candidates]):
-                    check_axis = LITERALS[house_type]["check_axis"]
-                    opposite_axis = LITERALS[house_type]["opposite_axis"]
-                    if len({getattr(cell, check_axis) for house in candidates for cell in house}) \
-                            == len({getattr(cell, opposite_axis) for house in candidates for cell in house}):
-                        if self.solve_proper_fish(digit, house_type, candidates):
-                            return True
-                    else:
-                        if self.solve_finned_fish(digit, house_type, candidates):
-                            return True
+        planes = self.sudoku.update_versions()
+        for variant, size, digit, house_type in product(Fish.VARIANTS, sizes, range(1, 10), RC):
+            plane = planes[digit - 1]
+            # Fish are only found if they remove something, and removing
+            # it changes the plane, so the search is only run again once
+            # the plane has changed.
+            found = self.cached(("fish", size, house_type), digit, lambda: {
+                kind: [Fish.fish_eliminations(plane, *fish) for fish in fish_list]
+                for kind, fish_list in Fish.fish_by_variant(plane, size, house_type, FRANKEN_FISH).items()
+            }, plane)
+            for targets in found[variant]:
+                if self.clear_candidates((index, digit) for index in board_indices(targets)):
+                    return True
         return False
 
     def check_for_hidden_rectangle(self) -> bool:
@@ -222,14 +421,7 @@ class Solver:
         two, in which case we look at its opposite, rather than two
         other cells.
         """
-        for rectangle in self.sudoku.rectangles():
-            if len({cell.box_num for cell in rectangle}) != 2: continue
-            if cells_are_empty(*rectangle) and at_least_one_cell_has_only_two_options(*rectangle):
-                if self.solve_hidden_rectangle_pairs(rectangle):
-                    return True
-                elif self.solve_hidden_rectangle_singles(rectangle):
-                    return True
-        return False
+        return self.clear_unique_rectangles(UniqueRectangle.HIDDEN_TYPES)
 
     def check_for_hidden_tuple(self) -> bool:
         """
@@ -237,12 +429,13 @@ class Solver:
         then all other options than those digits can be removed from
         those cells.
         """
-        sizes = range(2, 5)
-        for size, house_type in product(sizes, RCB):
-            iter_house = LITERALS[house_type]["iter_house"]
-            houses = getattr(self.sudoku, iter_house)
-            for house in houses:
-                if self.clear_hidden_tuple(house, size):
+        subsets = self.sudoku.updated(self.subset_index)
+        for size, house in product(range(2, MAX_TUPLE_SIZE + 1), range(len(HOUSES))):
+            for cells, digits in subsets.hidden[house]:
+                if len(cells) != size:
+                    continue
+                other_digits = mask_digits(ALL_DIGITS & ~digits)
+                if self.clear_candidates((index, digit) for index in cells for digit in other_digits):
                     return True
         return False
 
@@ -251,31 +444,67 @@ class Solver:
         If the only places for a digit in a row or column share a
         box, then other cells in that box cannot contain that digit.
         """
-        for house_type, digit in product(RC_ITER, range(1, 10)):
-            for house in getattr(self.sudoku, house_type):
-                cells_with_digit = {cell
-                                    for cell in house
-                                    if digit in cell}
-                if Sudoku.cells_share_a_box(*cells_with_digit):
-                    if self.clear_locked_candidate(cells_with_digit, digit):
-                        return True
-        return False
+        planes = self.sudoku.update_versions()
+        return self.clear_candidates(self.mini_line_eliminations(planes, "claiming"))
 
     def check_for_naked_tuple(self) -> bool:
         """
         If n cells in a house can only contain n different digits, then
         the other cells in that house cannot contain those digits.
         """
-        for size, house_type in product(range(2, 5), RCB_ITER):
-            for house in getattr(self.sudoku, house_type):
-                empty_cells = [cell for cell in house if cell.is_empty]
-                candidate_tuples = combinations(empty_cells, r=size)
-                for candidate_tuple in candidate_tuples:
-                    if self.cells_from_naked_tuple(*candidate_tuple):
-                        if self.clear_naked_tuples(house, candidate_tuple):
-                            return True
+        subsets = self.sudoku.updated(self.subset_index)
+        for size, house in product(range(2, MAX_TUPLE_SIZE + 1), range(len(HOUSES))):
+            for cells, digits in subsets.naked[house]:
+                if len(cells) != size:
+                    continue
+                others = [index for index in HOUSES[house] if index not in cells]
+                if self.clear_candidates((index, digit) for index in others for digit in mask_digits(digits)):
+                    return True
+        return False
+
+    def check_for_nishio(self) -> bool:
+        """
+        If filling a cell with a digit and following the singles that
+        result leads to a contradiction, then that cell cannot contain
+        that digit.
+        """
+        deadline = perf_counter() + FORCING_TIME_BUDGET
+        masks = self.sudoku.grid_masks()
+        for index, cell in self.forcing_cells():
+            for digit in sorted(cell.pencil_marks):
+                if Search.try_digit(masks, index, digit_bit(digit), FORCING_DEPTH) is None:
+                    cell.remove(digit)
+                    return True
+            if perf_counter() > deadline:
+                break
         return False
 
+    def check_for_pattern_overlay(self) -> bool:
+        """
+        Each digit's places in a solved sudoku form one of 46,656
+        templates (c.f. src.Template). An option which is in none of
+        the templates its digit could still use can be removed, and an
+        empty cell which is in all of them must hold the digit.
+        """
+        planes = self.sudoku.update_versions()
+        filled = self.sudoku.filled_planes()
+        removed, singles = [0] * 9, []
+        for digit in range(1, 10):
+            plane, placed = planes[digit - 1], filled[digit - 1]
+            removed[digit - 1], fixed = self.cached(
+                "overlay", digit, lambda: Template.overlay(plane, self.surviving_templates(digit, plane, placed)),
+                version=(plane, placed))
+            singles.extend((index, digit) for index in board_indices(fixed))
+        operated = self.clear_planes(removed)
+        for index, digit in singles:
+            cell = self.sudoku[KEYS[index]]
+            if cell.is_empty and digit in cell.pencil_marks:
+                cell.fill(digit)
+                operated = True
+        if singles:
+            self.sudoku.update_pencil_marks()
+        return operated
+
     def check_for_phistomefel_singles(self) -> bool:
         """
         In a completed sudoku, one will find that the digits in the 16
@@ -287,22 +516,7 @@ class Solver:
         Configurations of digits that violate this fact can be
         discarded.
         """
-        for corners, ring in self.sudoku.phistomefel_sets():
-            empty_corners = [cell for cell in corners if cell.is_empty]
-            if len(empty_corners) > 1:
-                continue
-            empty_rings = [cell for cell in ring if cell.is_empty]
-            if len(empty_rings) > 1:
-                continue
-            if empty_corners == empty_rings:
-                continue
-            missing_ring_digit: int = list_diff([cell.digit for cell in corners],
-                                                [cell.digit for cell in ring]).pop()
-            missing_corner_digit: int = list_diff([cell.digit for cell in ring],
-                                                  [cell.digit for cell in corners]).pop()
-            if self.clear_phistomefel_singles(empty_corners, empty_rings, missing_ring_digit, missing_corner_digit):
-                return True
-        return False
+        return self.fill_set_singles("phistomefel")
 
     def check_for_pointing_rectangle(self) -> bool:
         """
@@ -311,27 +525,21 @@ class Solver:
         the 2 other digits present in each cell, then any cell that
         sees all three cannot contain those digits.
         """
-        for a, b in combinations([cell for cell in self.sudoku if cell.is_empty], r=2):
-            if not a.sees(b): continue
-            if a.pencil_marks != b.pencil_marks: continue
-            if a.y == b.y:
-                for key in a.column:
-                    c = self.sudoku[key]
-                    d = self.sudoku[(b.x, c.y)]
-                    digits = self.pointing_rectangle_digits(a, b, c, d)
-                    if not digits: continue
-                    if self.clear_pointing_rectangle((c, d), digits, "row"):
-                        return True
-            elif a.x == b.x:
-                for key in a.row:
-                    c = self.sudoku[key]
-                    d = self.sudoku[(c.x, b.y)]
-                    digits = self.pointing_rectangle_digits(a, b, c, d)
-                    if not digits: continue
-                    if self.clear_pointing_rectangle((c, d), digits, "column"):
+        bivalues = self.sudoku.bivalues()
+        masks, planes = self.sudoku.masks, self.sudoku.planes
+        for pair in bivalues.pairs():
+            for a, b in combinations(bivalues.with_pair(pair), r=2):
+                if CELL_HOUSES[a][0] != CELL_HOUSES[b][0] and CELL_HOUSES[a][1] != CELL_HOUSES[b][1]:
+                    continue
+                for number in sorted(set(CELL_RECTANGLES[a]) & set(CELL_RECTANGLES[b])):
+                    c, d = (index for index in RECTANGLES[number] if index not in (a, b))
+                    if masks[c] & masks[d] & pair != pair:
+                        continue
+                    extras = (masks[c] | masks[d]) & ~pair
+                    if extras.bit_count() != 2:
+                        continue
+                    if self.clear_pointing_rectangle(c, d, extras, masks, planes):
                         return True
-            else:
-                continue
         return False
 
     def check_for_pointing_tuple(self) -> bool:
@@ -340,13 +548,36 @@ class Solver:
         or column, then other cells in that row or column cannot
         contain that digit.
         """
-        for digit, box in product(range(1, 10), self.sudoku.boxes):
-            pointing = {cell for cell in box if digit in cell}
-            pointed = self.cells_seen_by_pointing_tuple(pointing)
-            if self.remove_digits_from_cells(digit, *pointed):
-                return True
+        planes = self.sudoku.update_versions()
+        return self.clear_candidates(self.mini_line_eliminations(planes, "pointing"))
+
+    def check_for_remote_pair(self) -> bool:
+        """
+        In a chain of four or more cells which all contain the same two
+        options, each seeing the next, the cells alternate between the
+        two digits. Any cell which sees cells at both an odd and an even
+        position in the chain can therefore contain neither digit.
+        """
+        bivalues = self.sudoku.bivalues()
+        for pair in bivalues.pairs():
+            for even, odd in bivalues.coloured_chains(pair):
+                if (even | odd).bit_count() < 4:
+                    continue
+                targets = seen_by_any(even) & seen_by_any(odd) & ~(even | odd)
+                digits = mask_digits(pair)
+                if self.clear_candidates((index, digit) for index in board_indices(targets) for digit in digits):
+                    return True
         return False
 
+    def check_for_set_equivalence_singles(self) -> bool:
+        """
+        Groups of cells whose digits must match, such as those left
+        over by the Law of Leftovers in a jigsaw sudoku, can be added to
+        self.set_index. Once all but one cell in a pair of groups is
+        filled, that cell must hold the digit which balances them.
+        """
+        return self.fill_set_singles("user")
+
     def check_for_skyscraper(self) -> bool:
         """
         If there two rows have a pair of strongly connected cells and
@@ -358,59 +589,82 @@ class Solver:
         long as all the cells in that row that don't share that column
         share a box.
         """
-        for digit, house_type in product(range(1, 10), RC):
-            opposite_axis = LITERALS[house_type]["opposite_axis"]
-            houses_with_digit = self.sudoku.houses_with_digit(house_type, digit)
-            house_pairs = combinations(houses_with_digit, r=2)
-            for house_pair in house_pairs:
-                a = Sudoku.cells_in_group_with_digits({digit}, house_pair[0])
-                b = Sudoku.cells_in_group_with_digits({digit}, house_pair[1])
-                pair_house = [house for house in (a, b) if len(house) == 2]
-                if not pair_house:
-                    continue
-                flat_house_pair = {cell for house in (a, b) for cell in house}
-                opp_house_nums = {getattr(cell, opposite_axis) for cell in flat_house_pair}
-                if self.clear_skyscraper(digit, flat_house_pair, opp_house_nums, opposite_axis):
+        graph = self.sudoku.updated(self.link_graph)
+        planes = graph.planes
+        for digit in range(1, 10):
+            plane = planes[digit - 1]
+            for ends in self.find_skyscrapers(graph, digit, plane):
+                if self.clear_candidates((index, digit) for index in board_indices(seen_by_all(ends) & plane)):
                     return True
         return False
 
+    def check_for_turbot_fish(self) -> bool:
+        """
+        If two pairs of strongly connected cells on a digit have one
+        cell each which see each other, at most one of those two can be
+        the digit, so at least one of the other two must be. Any cell
+        which sees both of those cannot contain the digit. Skyscrapers
+        and 2-String Kites are the cases where both pairs are in rows or
+        columns.
+        """
+        return self.clear_turbot_fish("turbot")
+
     def check_for_two_colour_logic(self) -> bool:
         """
-        In a chain of strongly connected cells, there are two
-        possibilities: either every even cell contains the strongly
-        connecting digit, or ever odd cell does. Cells which see at
-        least one cell from each colour can therefore not contain the
-        digit.
+        Cells joined by strong links on a digit can be split into two
+        colours: either every cell of one colour contains the digit, or
+        every cell of the other does. If two cells of the same colour see
+        each other, that colour cannot contain the digit. Otherwise,
+        cells which see at least one cell of each colour can not contain
+        the digit.
         """
+        graph = self.sudoku.updated(self.link_graph)
+        planes = graph.planes
         for digit in range(1, 10):
-            strongly_connected_pairs = self.sudoku.strongly_connected_pairs_with_digit(digit)
-            if not strongly_connected_pairs: continue
-            strongly_connected_chains = self.strongly_connected_cell_chains(strongly_connected_pairs)
-            coloured_chains = self.colour_pairs_for_strongly_connected_chains(strongly_connected_chains)
-            if self.clear_colour_contradiction(digit, coloured_chains):
+            components = graph.colour_components(digit)
+            if self.clear_colour_contradiction(digit, components):
                 return True
-            if self.clear_colour_chain(digit, coloured_chains):
+            if self.clear_colour_chain(digit, components, planes[digit - 1]):
                 return True
         return False
 
+    def check_for_two_string_kite(self) -> bool:
+        """
+        If a digit can only be in two places in a row and two places in
+        a column, and one place from each shares a box, then any cell
+        which sees both other places cannot contain the digit.
+        """
+        return self.clear_turbot_fish("kite")
+
     def check_for_unique_rectangle(self) -> bool:
         """
-        If a digit can only be in two cells in each of its row and
-        column, and those three cells in those rows and columns form a
-        rectangle with a fourth cell which contains the same options,
-        as its opposite, then the opposite cell cannot contain that
-        digit.
-        """
-        for box in self.sudoku.boxes:
-            pairs = [cell for cell in box if len(cell.pencil_marks) == 2]
-            for a, b in combinations(pairs, r=2):
-                if self.cells_from_naked_tuple(a, b):
-                    cell, target = self.unique_rectangle_cell_and_target(a, b)
-
-                    if cell is not None and target is not None:
-                        if intersection := cell.pencil_marks.intersection(target.pencil_marks):
-                            target.remove(intersection)
-                            return True
+        If four cells in a rectangle across two boxes could all be the
+        same two digits, they could be swapped to give a second
+        solution. Options which would leave the rectangle with only
+        those two digits can therefore be removed (c.f. UniqueRectangle
+        for each type of rectangle).
+        """
+        return self.clear_unique_rectangles(UniqueRectangle.UNIQUE_TYPES)
+
+    def check_for_unit_forcing_chain(self) -> bool:
+        """
+        A digit must appear in one of the cells of a house that can
+        contain it, so if following the singles from each of those
+        cells in turn removes a pencil mark from some cell every time,
+        that pencil mark can be removed.
+        """
+        deadline = perf_counter() + FORCING_TIME_BUDGET
+        masks = self.sudoku.grid_masks()
+        for house, digit in product(HOUSES, range(1, 10)):
+            bit = digit_bit(digit)
+            places = [index for index in house if masks[index] & bit]
+            if len(places) < 2:
+                continue
+            branches = [(index, bit) for index in places]
+            if self.clear_forced_candidates(masks, Search.forced_masks(masks, branches, FORCING_DEPTH)):
+                return True
+            if perf_counter() > deadline:
+                break
         return False
 
     def check_for_vdw_square_singles(self) -> bool:
@@ -422,26 +676,59 @@ class Solver:
         the full box from both sets leaves us with two caret-shaped
         regions which share the same relation.
         """
-        full_set = [i for i in range(1, 10)]
-        for major, minor in self.sudoku.vdw_squares():
-            major_filled = [cell for cell in major if not cell.is_empty]
-            minor_filled = [cell for cell in minor if not cell.is_empty]
-            major_digits = [cell.digit for cell in major_filled]
-            minor_digits = [cell.digit for cell in minor_filled]
-            if len(major_filled) == 15 and len(minor_filled) == 7:
-                major_expected = [cell.digit for cell in minor_filled] + [i for i in range(1, 10)]
-                digit = list_diff(major_expected, major_digits).pop()
-                empty_cell = {cell for cell in major if cell.is_empty}.pop()
-                empty_cell.fill(digit)
-                return True
-            if len(major_filled) == 16 and len(minor_filled) == 6:
-                major_digits_minus_full_set = list_diff(major_digits, full_set)
-                digit = list_diff(major_digits_minus_full_set, minor_digits).pop()
-                empty_cell = {cell for cell in minor if cell.is_empty}.pop()
-                empty_cell.fill(digit)
+        return self.fill_set_singles("van de wetering")
+
+    def check_for_wwing(self) -> bool:
+        """
+        If two cells which do not see each other contain the same two
+        options, and one of those digits can only be in two places in a
+        house, one seeing each cell, then the digit is in at most one of
+        the two cells. One of them must contain the other digit, so any
+        cell which sees both cannot contain it.
+        """
+        bivalues = self.sudoku.bivalues()
+        graph = self.sudoku.updated(self.link_graph)
+        for pair in bivalues.pairs():
+            for a, b in combinations(bivalues.with_pair(pair), r=2):
+                if PEER_BOARDS[a] >> b & 1:
+                    continue
+                for digit in mask_digits(pair):
+                    if not self.cells_are_joined_by_conjugate_pair(graph, digit, a, b):
+                        continue
+                    other_digit = (pair ^ digit_bit(digit)).bit_length()
+                    targets = board_indices(PEER_BOARDS[a] & PEER_BOARDS[b])
+                    if self.clear_candidates((index, other_digit) for index in targets):
+                        return True
+        return False
+
+    def check_for_x_chain(self) -> bool:
+        """
+        An alternating inference chain (c.f. check_for_aic) which only
+        uses a single digit: strong links are the only two places for
+        the digit in a house, and weak links are cells that see each
+        other.
+        """
+        self.sudoku.updated(self.link_graph)
+        for digit in range(1, 10):
+            starts = [node(index, digit)
+                      for index, cell in enumerate(self.sudoku) if cell.is_empty and digit in cell]
+            if self.clear_alternating_chains(starts, "x"):
                 return True
         return False
 
+    def check_for_xy_chain(self) -> bool:
+        """
+        An alternating inference chain (c.f. check_for_aic) made only of
+        cells with two options, in which each strong link is between a
+        cell's two options and each weak link is a shared digit between
+        cells that see each other.
+        """
+        self.sudoku.updated(self.link_graph)
+        starts = [node(index, digit)
+                  for index in self.sudoku.bivalues().cells()
+                  for digit in sorted(self.sudoku[KEYS[index]].pencil_marks)]
+        return self.clear_alternating_chains(starts, "xy")
+
     def check_for_xyzwings(self) -> bool:
         """
         If a cell contains only three options and sees two other cells
@@ -450,8 +737,9 @@ class Solver:
         cell, then any cell which sees all three cells cannot contain
         the digit shared by all three.
         """
-        for index, triple in self.possible_xyzwing_triples():
-            if self.clear_xyzwing(index, triple):
+        for pivot, wing_a, wing_b, digit in self.find_xyzwings():
+            targets = board_indices(PEER_BOARDS[pivot] & PEER_BOARDS[wing_a] & PEER_BOARDS[wing_b])
+            if self.clear_candidates((index, digit) for index in targets):
                 return True
         return False
 
@@ -462,701 +750,306 @@ class Solver:
         other two, then any cell which sees those other two cannot
         contain their shared digit.
         """
-        triples = self.find_ywing_triples()
-        if ywings := self.find_valid_ywings(triples):
-            for ywing in ywings:
-                if self.clear_ywing(ywing):
-                    return True
+        for wing_a, wing_b, digit in self.find_ywings():
+            targets = board_indices(PEER_BOARDS[wing_a] & PEER_BOARDS[wing_b])
+            if self.clear_candidates((index, digit) for index in targets):
+                return True
         return False
 
     # Methods for doing solver logic work
 
-    def clear_colour_contradiction(self, digit: int, coloured_chains):
-        for chain_pair in coloured_chains:
-            for chain in chain_pair:
-                if len(chain) <= 1: continue
-                contradiction = max([c_1.sees(c_2) for c_1, c_2 in combinations(chain, r=2)])
-                if contradiction:
-                    if self.remove_digits_from_cells(digit, *chain):
+    def clear_colour_contradiction(self, digit: int, components: list[tuple[int, int]]) -> bool:
+        """
+        Remove digit from every cell of the first colour in components
+        (c.f. LinkGraph.colour_components) which sees itself. Return
+        False if no changes were made.
+        """
+        for colours in components:
+            for colour in colours:
+                if any(PEER_BOARDS[index] & colour for index in board_indices(colour)):
+                    if self.clear_candidates((index, digit) for index in board_indices(colour)):
                         return True
         return False
 
-    @staticmethod
-    def clear_avoidable_rectangle(top_left, top_right, bot_left, bot_right) -> bool:
-        operated = False
-        if top_left.digit == bot_right.digit:
-            if top_right.is_empty and not bot_left.is_empty:
-                if bot_left.digit in top_right.pencil_marks:
-                    top_right.pencil_marks.remove(bot_left.digit)
-                    operated = True
-            elif bot_left.is_empty and not top_right.is_empty:
-                if top_right.digit in bot_left.pencil_marks:
-                    bot_left.pencil_marks.remove(top_right.digit)
-                    operated = True
-        elif top_right.digit == bot_left.digit:
-            if top_left.is_empty and not bot_right.is_empty:
-                if bot_right.digit in top_left.pencil_marks:
-                    top_left.pencil_marks.remove(bot_right.digit)
-                    operated = True
-            elif bot_right.is_empty and not top_left.is_empty:
-                if top_left.digit in bot_right.pencil_marks:
-                    bot_right.pencil_marks.remove(top_left.digit)
-                    operated = True
-        return operated
-
-    def clear_colour_chain(self, digit, coloured_chains):
-        seen_cells = self.cells_seen_by_colour_chains(coloured_chains)
-        if self.remove_digits_from_cells(digit, *seen_cells):
-            return True
-
-    @staticmethod
-    def clear_hidden_rectangle_pair(digit, pair, pencil_marks):
-        operated = False
-        removed_digit = next(iter(d for d in pencil_marks if d != digit))
-        for focus in pair:
-            if focus.remove(removed_digit):
-                operated = True
-        return operated
-
-    def clear_finned_fish(self, digit, opposite_axis, candidates_cells, perp_group) -> bool:
+    def clear_alternating_chains(self, starts: list[int], kind: str) -> bool:
         """
-        Clears digit from pencil marks affected by finned fish. Return
-        false if no changes were made.
+        Remove candidates weakly linked to both ends of the first
+        alternating chain of the given kind (c.f. LinkGraph.strong_links)
+        from any of starts which allows it. Return False if no changes
+        were made.
         """
-        flat_proper_fish = {cell for house in perp_group for cell in house}
-        proper_fish_perp_house_nums = {getattr(cell, opposite_axis) for cell in flat_proper_fish}
-        fin_cells = candidates_cells - flat_proper_fish
-        fin_boxes = {cell.box_num for cell in fin_cells}
-        non_fin_boxes = {cell.box_num for cell in flat_proper_fish}
-        if not fin_boxes.intersection(non_fin_boxes):
-            return False
-
-        if len(affected_box_num := {cell.box_num for cell in fin_cells}) == 1:
-            affected_box = self.sudoku.box(affected_box_num.pop())
-            affected_cells = {cell
-                              for cell in affected_box
-                              if getattr(cell, opposite_axis) in proper_fish_perp_house_nums
-                              and cell not in candidates_cells}
-            affected_cells -= {cell
-                               for cell in affected_cells
-                               if len([f for f in flat_proper_fish if f.sees(cell)]) <= 1}
-            if self.remove_digits_from_cells(digit, *affected_cells):
-                return True
+        graph = self.link_graph
+        for start in starts:
+            for end in graph.chain_ends(start, CHAIN_LENGTH, kind):
+                if end == start:
+                    continue
+                operated = False
+                for eliminated in graph.eliminations(start, end):
+                    if self.sudoku[KEYS[node_index(eliminated)]].remove(node_digit(eliminated)):
+                        operated = True
+                if operated:
+                    return True
         return False
 
-    @staticmethod
-    def clear_phistomefel_singles(empty_corners: list[Cell], empty_rings: list[Cell],
-                                  missing_ring_digit, missing_corner_digit) -> bool:
-        operated = False
-        if len(empty_corners) == 1:
-            empty_corner: Cell = empty_corners.pop()
-            missing_digit: int = missing_corner_digit
-            empty_corner.fill(missing_digit)
-            operated = True
-        if len(empty_rings) == 1:
-            empty_ring: Cell = empty_rings.pop()
-            missing_digit: int = missing_ring_digit
-            empty_ring.fill(missing_digit)
-            operated = True
-        return operated
-
-    def clear_pointing_rectangle(self, pointing_pair, extra_digits, house) -> bool:
-        operated = False
-        c, d = pointing_pair
-        for pointing in [self.sudoku[key] for key in getattr(c, house)]:
-            if pointing.pencil_marks == extra_digits:
-                pointed_keys = Cell.intersection(c, d, pointing)
-                pointed = [self.sudoku[key] for key in pointed_keys]
-                for cell in pointed:
-                    cell.remove(pointing.pencil_marks)
-                    operated = True
-        return operated
-
-    def clear_hidden_rectangle_single(self, digit, focus, opposite) -> bool:
-        for house_type in RC:
-            check_axis = LITERALS[house_type]["check_axis"]
-            single_house = LITERALS[house_type]["single_house"]
-
-            group = {cell
-                     for cell in getattr(self.sudoku, single_house)(getattr(opposite, check_axis))
-                     if digit in cell}
-            if not self.cells_are_strongly_connected_by_digit(digit, *group):
-                break
-        else:
-            digit_to_remove = focus.pencil_marks - {digit}
-            if opposite.remove(digit_to_remove):
+    def clear_colour_chain(self, digit: int, components: list[tuple[int, int]], plane: int) -> bool:
+        """
+        Remove digit from the places in plane which see both colours of
+        the first component in components that allows it. Return False
+        if no changes were made.
+        """
+        for a, b in components:
+            targets = seen_by_any(a) & seen_by_any(b) & plane & ~(a | b)
+            if self.clear_candidates((index, digit) for index in board_indices(targets)):
                 return True
         return False
 
-    def clear_hidden_tuple(self, house, size) -> bool:
-        for digits in combinations(range(1, 10), r=size):
-            candidate_tuple = Sudoku.cells_in_group_with_digits(digits, house)
-            if len(candidate_tuple) != size: continue
-            if self.cells_form_hidden_tuple(digits, candidate_tuple):
-                other_digits = set(range(1, 10)) - set(digits)
-                if self.remove_digits_from_cells(other_digits, *candidate_tuple):
+    def clear_pointing_rectangle(self, c: int, d: int, extras: int, masks: list[int], planes: list[int]) -> bool:
+        """
+        Remove the digits in extras from cells which see c, d and a cell
+        sharing a house with them whose mask is extras. Return False if
+        no changes were made.
+        """
+        for house in set(CELL_HOUSES[c]) & set(CELL_HOUSES[d]):
+            for pointing in HOUSES[house]:
+                if masks[pointing] != extras or pointing in (c, d):
+                    continue
+                seen = PEER_BOARDS[c] & PEER_BOARDS[d] & PEER_BOARDS[pointing]
+                if self.clear_candidates((index, digit)
+                                         for digit in mask_digits(extras)
+                                         for index in board_indices(seen & planes[digit - 1])):
                     return True
         return False
 
-    def clear_locked_candidate(self, locked_candidate, digit) -> bool:
-        box_num = next(iter(locked_candidate)).box_num
-        affected = set(self.sudoku.box(box_num)) - locked_candidate
-        if self.remove_digits_from_cells(digit, *affected):
-            return True
-        return False
-
-    def clear_naked_tuples(self, house, tuple_cells):
-        non_members: set[Cell] = set(house) - set(tuple_cells)
-        marks = [tuple(cell.pencil_marks) for cell in tuple_cells]
-        options = {digit for pms in marks for digit in pms}
-        if self.remove_digits_from_cells(options, *non_members):
-            return True
-
-    def clear_proper_fish(self, digit: int, fish_cells: set[Cell], perp_house_nums: set[int], house_type: str):
+    def clear_candidates(self, candidates: Iterable[tuple[int, int]]) -> bool:
         """
-        Clears digit from pencil marks affected by x-wings, swordfish,
-        and jellyfish. Return false if no changes were made.
+        Remove each (index, digit) candidate from self.sudoku. Return
+        False if no changes were made.
         """
         operated = False
-        opposite_house_type = LITERALS[house_type]["opposite_house"]
-        for house_num in perp_house_nums:
-            house = getattr(self.sudoku, opposite_house_type)(house_num)
-            affected_cells = {cell for cell in house if cell not in fish_cells}
-            if self.remove_digits_from_cells(digit, *affected_cells):
+        for index, digit in candidates:
+            if self.sudoku[KEYS[index]].remove(digit):
                 operated = True
         return operated
 
-    def clear_skyscraper(self, digit, cells, house_nums, axis) -> bool:
-        for house_num in house_nums:
-            if len(base := {cell
-                            for cell in cells
-                            if getattr(cell, axis) == house_num}) == 2:
-                skyscrapers = cells - base
-                affected_keys = Cell.intersection(*skyscrapers)
-                affected_cells = {self.sudoku[key] for key in affected_keys}
-                if self.remove_digits_from_cells(digit, *affected_cells):
-                    return True
-        return False
-
-    def clear_xyzwing(self, index, triple):
-        shared_digit = self.xyzwing_triple_shared_digit(index, triple)
-        affected_cells = self.xyzwing_affected_cells(shared_digit, triple)
-        if self.remove_digits_from_cells(shared_digit, *affected_cells):
-            return True
-        return False
-
-    def cells_are_strongly_connected_by_digit(self, digit: int, *cells: Cell) -> bool:
+    def clear_planes(self, planes: list[int]) -> bool:
         """
-        Return whether input cells are the only two cells in their
-        row, or column that can be digit.
+        Remove each digit d from the cells in the board at d - 1 of
+        planes. Return False if no changes were made.
         """
-        if len(cells) != 2:
-            return False
-        if Sudoku.cells_share_a_column(*cells):
-            axis = "x"
-            house_type = "column"
-        elif Sudoku.cells_share_a_row(*cells):
-            axis = "y"
-            house_type = "row"
-        elif Sudoku.cells_share_a_box(*cells):
-            axis = "house_num"
-            house_type = "box"
-        else:
-            return False
-        return len([
-            cell
-            for cell in getattr(self.sudoku, house_type)(getattr([*cells][0], axis))
-            if digit in cell
-        ]) == 2
-
-    @staticmethod
-    def cells_form_hidden_tuple(digits, candidate_tuple) -> bool:
-        """
-        If input cells individually contain two of input digits and
-        together contain all three digits, then they are a hidden tuple.
-        """
-        digits = set(digits)
-        cells_individually_contain_at_least_two_of_digits = min(
-            [len(cell.pencil_marks.intersection(digits)) >= 2
-             for cell in candidate_tuple]
-        )
-        cells_together_contain_all_digits = digits.issubset(
-            set.union(*[cell.pencil_marks for cell in candidate_tuple])
-        )
-        return cells_individually_contain_at_least_two_of_digits and cells_together_contain_all_digits
-
-    @staticmethod
-    def cells_from_naked_tuple(*cells) -> bool:
-        """Return whether input cells cumulatively contain exactly as
-        many possible digits as there are input cells."""
-        pencil_marks = [cell.pencil_marks for cell in cells]
-        flattened_pms = {digit for house in pencil_marks for digit in house}
-        if len(set.union(flattened_pms)) != len(cells):
-            return False
-        return True
+        return self.clear_candidates((index, digit)
+                                     for digit, plane in enumerate(planes, 1)
+                                     for index in board_indices(plane))
 
-    def cells_seen_by_colour_chains(self, colour_chains: list[list[list[Cell]]]) -> set[Cell | Any]:
+    def clear_unique_rectangles(self, types: tuple[str, ...]) -> bool:
         """
-        Return cells which are seen by two or more cells of different
-        colours from colour chains.
-        :param colour_chains: Lists of cells separated by their colour
+        Remove the candidates of the first unique rectangle of one of
+        types (c.f. UniqueRectangle) which allows it. Return False if no
+        changes were made.
         """
-        result = set()
-        for chain_pair in colour_chains:
-            for seer_pair in product(*chain_pair):
-                seen = {self.sudoku[key] for key in Cell.intersection(*seer_pair)}
-                result.update({cell for cell in seen if cell.is_empty})
-        return result
+        rectangles = self.sudoku.updated(self.rectangle_index)
+        for _, candidates in UniqueRectangle.find_unique_rectangles(rectangles, types):
+            if self.clear_candidates(candidates):
+                return True
+        return False
 
-    def cells_seen_by_pointing_tuple(self, pointing: set[Cell]) -> set[Cell]:
+    def clear_forced_candidates(self, masks: list[int], forced: Optional[list[int]]) -> bool:
         """
-        Return cells in the row or column that all cells in pointing
-        share, minus the cells in pointing. If no such row or column
-        exists, return an empty set.
-        :param pointing: Set of cells that share a box and digit.
-        :return: Set of cells that share a row or column and a digit.
+        Remove pencil marks which appear in masks but not in forced
+        from the empty cells of self.sudoku. Return False if no changes
+        were made.
         """
-        if Sudoku.cells_share_a_row(*pointing):
-            pointed = set(self.sudoku.row(next(iter(pointing)).y))
-        elif Sudoku.cells_share_a_column(*pointing):
-            pointed = set(self.sudoku.column(next(iter(pointing)).x))
-        else:
-            return set()
-        pointed -= pointing
-        return pointed
-
-    @staticmethod
-    def colour_pairs_for_strongly_connected_chains(chains: list[list[Cell]]) -> list[list[list[Cell]]]:
-        """
-        Separates each chain in chains into its odd and even elements.
-        :param chains: List of chains of strongly connected cells.
-        """
-        result = []
-        for chain in chains:
-            evens = []
-            odds = []
-            for i, cell in enumerate(chain):
-                if i % 2 == 0:
-                    evens.append(cell)
-                elif i % 2 == 1:
-                    odds.append(cell)
-            result.append([evens, odds])
-        return result
-
-    @staticmethod
-    def find_empty_rectangle_house(house_type, rectangle) -> int:
-        """
-        Return the house_num that the cells which share a row or column in
-        an empty rectangle box share.
-        """
-        a = {0, 1, 2}
-        b = {3, 4, 5}
-        c = {6, 7, 8}
-        check_axis = LITERALS[house_type]["check_axis"]
-
-        house_nums = {getattr(cell, check_axis) for cell in rectangle}
-        for num_set in a, b, c:
-            if len(num := (num_set - house_nums)) == 1:
-                return num.pop()
-
-    def find_empty_rectangle_perp_sc_cell(self, row_num: int, column_num: int, digit: int) -> Optional[Cell]:
-        """
-        Return the cell in a strongly connected pair with a cell seen
-        by a cell that lies in an empty rectangle's row or column that
-        lies in the empty rectangle's other column or row. If no such
-        cell exists, returns None.
-        """
-        rectangle_box_num = self.sudoku[column_num, row_num].box_num
-        for house_type in "row", "column":
-            check_axis = LITERALS[house_type]["check_axis"]
-            single_house = LITERALS[house_type]["single_house"]
-            opposite_axis = LITERALS[house_type]["opposite_axis"]
-            opposite_house = LITERALS[house_type]["opposite_house"]
-            er_house_num = row_num if house_type == "row" else column_num
-            er_opp_house_num = column_num if house_type == "row" else row_num
-            digit_cells = {cell
-                           for cell in getattr(self.sudoku, house_type)(er_house_num)
-                           if digit in cell and cell not in self.sudoku.box(rectangle_box_num)}
-            for cell_1 in digit_cells:
-                perp_group = {cell
-                              for cell in getattr(self.sudoku, opposite_house)(getattr(cell_1, opposite_axis))
-                              if digit in cell and cell not in self.sudoku.box(rectangle_box_num)}
-                for cell_2 in perp_group:
-                    contra_perp_group = {cell
-                                         for cell in getattr(self.sudoku, single_house)(getattr(cell_2, check_axis))
-                                         if digit in cell}
-                    if len(contra_perp_group) != 2:
-                        continue
-                    if min([cell.box_num == er_house_num for cell in contra_perp_group]):
-                        continue
-                    contra_cell = next(iter(contra_perp_group - {cell_2}))
-                    if contra_cell in self.sudoku.box(rectangle_box_num):
-                        continue
-                    if getattr(contra_cell, opposite_axis) == er_opp_house_num:
-                        return cell_1
-        return None
-
-    @staticmethod
-    def find_valid_ywings(triples) -> list[Optional[list[Cell, Cell]]]:
-        """Return either an empty list or a list containing pairs of
-        cells which are the wings of ywings."""
-        ywings = []
-        for a, b, c in triples:
-            if a.sees(b):
-                if a.sees(c):
-                    if not b.sees(c):
-                        ywings.append([b, c])
-                elif b.sees(c):
-                    ywings.append([a, c])
-            elif a.sees(c) and b.sees(c):
-                ywings.append([a, b])
-        return ywings
-
-    def find_ywing_triples(self) -> list[tuple[Cell, Cell, Cell]]:
-        """
-        Return a list of tuples of cells in self.sudoku which meet
-        the following criteria:
-
-        - there are three cells in the tuple;
-        - all cells have 2 options;
-        - each cell hase 1 and only 1 overlapping option with each other cell;
-        - the cells together have a total of 3 unique options between them.
-        """
-
-        return [
-            (a, b, c) for a, b, c in combinations(self.sudoku, r=3)
-            if ((len(a.pencil_marks) == len(b.pencil_marks) == len(c.pencil_marks) == 2)
-                and (len(a.pencil_marks.intersection(b.pencil_marks))
-                     == len(a.pencil_marks.intersection(c.pencil_marks))
-                     == len(b.pencil_marks.intersection(c.pencil_marks))
-                     == 1)
-                and (len(a.pencil_marks.union(b.pencil_marks, c.pencil_marks)) == 3))
-        ]
-
-    def clear_ywing(self, ywing) -> bool:
+        if forced is None:
+            return False
         operated = False
-        wing_a, wing_b = ywing
-        shared_digit: int = wing_a.pencil_marks.intersection(wing_b.pencil_marks).pop()
-        affected_cells = {cell for cell in self.sudoku
-                          if (cell.sees(wing_a) and cell.sees(wing_b))}
-        if self.remove_digits_from_cells(shared_digit, *affected_cells):
-            return True
+        for index, cell in enumerate(self.sudoku):
+            if cell.is_empty and (removed := masks[index] & ~forced[index]):
+                if cell.remove(set(mask_digits(removed))):
+                    operated = True
         return operated
 
-    def match_endpoints_with_adjacencies(self, adjacencies, endpoints) -> list:
-        """
-        Match each endpoint cell with adjacent cells and return the
-        results after pruning duplicates.
-        """
-        chains = [[cell] for cell in endpoints]
-        while (
-                max([chain[0] == chain[-1] or chain[-1] not in endpoints
-                     for chain in chains])
-        ):
-            no_change_counter = 0
-            for chain in chains:
-                cell: Cell = chain[-1]
-                connected: set[Cell] = {c for c in adjacencies[cell]}
-                for checked in chain:
-                    connected -= {checked}
-                if len(connected) == 0:
-                    no_change_counter += 1
-                    continue
-                elif len(connected) == 1:
-                    chain.append(next(iter(connected)))
-                else:
-                    chains.remove(chain)
-                    for other_cell in connected:
-                        new_chain = [_cell for _cell in chain]
-                        new_chain.append(other_cell)
-                        chains.append(new_chain)
-            if no_change_counter == len(chains):
-                break
-        self.remove_duplicate_chains(chains)
-        return chains
-
-    @staticmethod
-    def pointing_rectangle_digits(a: Cell, b: Cell, c: Cell, d: Cell) -> set:
+    def clear_turbot_fish(self, kind: str) -> bool:
         """
-        Return digits, if any, that are in a pointing rectangle made up of
-        input cells.
+        Remove each digit from the cells which see both free ends of
+        the first turbot fish of kind (c.f. find_turbot_fish) which
+        allows it. Return False if no changes were made.
         """
-        if c.is_empty:
-            if c.pencil_marks.issuperset(a.pencil_marks):
-                if d.is_empty:
-                    if d.pencil_marks.issuperset(b.pencil_marks):
-                        return set.union(
-                            *[c.pencil_marks - a.pencil_marks, d.pencil_marks - a.pencil_marks]
-                        )
+        graph = self.sudoku.updated(self.link_graph)
+        planes = graph.planes
+        for digit in range(1, 10):
+            plane = planes[digit - 1]
+            for a, b in self.find_turbot_fish(graph, digit, kind):
+                targets = seen_by_all(1 << a | 1 << b) & plane
+                if self.clear_candidates((index, digit) for index in board_indices(targets)):
+                    return True
+        return False
 
-    def possible_xyzwing_triples(self) -> Generator[tuple[int, [Cell, Cell, Cell]], None, None]:
+    @staticmethod
+    def cells_are_joined_by_conjugate_pair(graph: LinkGraph, digit: int, a: int, b: int) -> bool:
         """
-        Yields cells which form an xyzwing and the digit that connects
-        them.
-        :return: digit, tuple(cells which form an xyzwing with digit)
+        Return whether the only two places for digit in some house are
+        cells other than a and b, one of which sees a and the other b.
         """
-        for triple in combinations(self.sudoku, r=3):
-            if len({cell.box_num for cell in triple}) != 2:
+        for u, v in graph.conjugate_pairs(digit):
+            if {u, v} & {a, b}:
                 continue
-
-            indices = set(range(3))
-            for i in range(3):
-                axis = triple[i]
-                wings = [triple[x] for x in indices - {i}]
-                if len(axis.pencil_marks) == 3 and len(wings[0].pencil_marks) == len(wings[1].pencil_marks) == 2:
-                    yield i, triple
-
-    def potential_avoidable_rectangles(self) -> Generator[tuple[Cell, Cell, Cell, Cell], None, None]:
-        """
-        Yield groups of 4 cells which form a rectangle and could lead
-        to a sudoku with more than one correct solution.
-        """
-        for rectangle in self.sudoku.rectangles():
-            if self.rectangle_is_avoidable(rectangle):
-                yield rectangle
+            if PEER_BOARDS[a] >> u & 1 and PEER_BOARDS[b] >> v & 1 \
+                    or PEER_BOARDS[a] >> v & 1 and PEER_BOARDS[b] >> u & 1:
+                return True
+        return False
 
     @staticmethod
-    def rectangle_is_avoidable(rectangle) -> bool:
-        """Return true if filling in the rectangle improperly would
-         break uniqueness."""
-        if (min([cell.started_empty for cell in rectangle])
-                and len({cell.box_num for cell in rectangle}) == 2
-                and len([cell for cell in rectangle if cell.is_empty]) == 1):
-            return True
+    def empty_rectangle_targets(graph: LinkGraph, digit: int, box: int, row: int, column: int) -> int:
+        """
+        Return the board of cells which can't be digit because of the
+        empty rectangle in box whose places lie on row and column.
+
+        If one end of a strong link on digit in another column lies on
+        row, the cell in column and the row of its other end can't be
+        the digit, or neither row nor column could hold it in box. The
+        same goes for strong links in other rows with an end on column.
+        """
+        targets = 0
+        band, stack = divmod(box, 3)
+        for line in range(9):
+            if line // 3 != stack and (pair := graph.conjugates[9 + line][digit - 1]):
+                for a, b in (pair, pair[::-1]):
+                    if a // 9 == row and b // 27 != band:
+                        targets |= 1 << (b // 9 * 9 + column)
+            if line // 3 != band and (pair := graph.conjugates[line][digit - 1]):
+                for a, b in (pair, pair[::-1]):
+                    if a % 9 == column and b % 9 // 3 != stack:
+                        targets |= 1 << (9 * row + b % 9)
+        return targets
+
+    def forcing_cells(self) -> list[tuple[int, Cell]]:
+        """
+        Return (index, cell) pairs for the empty cells of self.sudoku,
+        ordered from fewest to most pencil marks.
+        """
+        empty = [(index, cell) for index, cell in enumerate(self.sudoku) if cell.is_empty]
+        return sorted(empty, key=lambda pair: len(pair[1].pencil_marks))
+
+    def surviving_templates(self, digit: int, plane: int, placed: int) -> list[int]:
+        """
+        Return the templates of digit which survive (c.f.
+        Template.surviving_templates) with places plane and placements
+        placed. If digit has only lost places and gained placements
+        since the last call, only the templates which survived then are
+        checked.
+        """
+        last = self.templates[digit - 1]
+        pool = None
+        if last is not None and not (plane | placed) & ~(last[0] | last[1]) and not last[1] & ~placed:
+            pool = last[2]
+        survivors = Template.surviving_templates(plane, placed, pool)
+        self.templates[digit - 1] = plane, placed, survivors
+        return survivors
 
     @staticmethod
-    def remove_digits_from_cells(digits: int | Iterable[int], *cells: Cell) -> bool:
+    def find_skyscrapers(graph: LinkGraph, digit: int, plane: int) -> Generator[int, None, None]:
         """
-        Removes digits from cells if the digits exist.
-        Returns False if no changes were made.
+        Yield a board for each skyscraper on digit, holding the places
+        of which at least one must be the digit. Each skyscraper joins
+        a row or column in which the digit has two places (c.f.
+        LinkGraph.conjugate_houses) with another line of the same kind
+        in which the digit has exactly one place in line with either
+        of them.
         """
-        operated = False
-        for cell in cells:
-            if cell.remove(digits):
-                operated = True
-        return operated
-
-    @staticmethod
-    def remove_duplicate_chains(chains: list[list[Cell]]) -> None:
-        """Remove colour_chains from the input that are either too short or
-        (perhaps reversed) duplicates."""
-        for x, y in combinations(chains, r=2):
-            if len(x) == len(y):
-                if x in chains and len(x) <= 2:
-                    chains.remove(x)
-                if y in chains and x == y[::-1]:
-                    chains.remove(y)
-
-    def solve_finned_fish(self, digit: int, house_type: str, candidates: list[list[Cell]]) -> bool:
-        """
-        Checks for finned x-wings, swordfish, and jellyfish on digit in candidates.
-        """
-        opposite_axis = LITERALS[house_type]["opposite_axis"]
-        check_axis = LITERALS[house_type]["check_axis"]
-        size = len(candidates)
-        candidates_cells = {cell for house in candidates for cell in house}
-        fish_perp_house_nums = {getattr(cell, opposite_axis) for cell in candidates_cells}
-        fish_by_perp_house = [
-            [cell for cell in candidates_cells
-             if getattr(cell, opposite_axis) == house_num]
-            for house_num in fish_perp_house_nums
-        ]
-        perp_candidate_groups = combinations(fish_by_perp_house, r=size)
-        for perp_group in perp_candidate_groups:
-            if len({getattr(cell, check_axis) for house in perp_group for cell in house}) != size:
+        for house, pair in graph.conjugate_houses(digit):
+            if house >= 18:
                 continue
-            if self.clear_finned_fish(digit, opposite_axis, candidates_cells, perp_group):
-                return True
-        return False
-
-    def solve_hidden_rectangle_pairs(self, rectangle) -> bool:
-        for house_type, pair in product(RC, combinations(rectangle, r=2)):
-            check_axis = LITERALS[house_type]["check_axis"]
-
-            if cells_share_axis(check_axis, *pair) and self.cells_from_naked_tuple(*pair):
-                pencil_marks = pair[0].pencil_marks
-                opposite_pair: set[Cell, Cell] = {*rectangle} - {*pair}
-                if all_cells_in_house_contain_pencil_marks(opposite_pair, pencil_marks) is False:
+            kind = house // 9
+            for other in range(9 * kind, 9 * kind + 9):
+                places = plane & HOUSE_BOARDS[other]
+                if other == house or not places:
                     continue
-                for digit in pencil_marks:
-                    if self.cells_are_strongly_connected_by_digit(digit, *opposite_pair):
-                        if self.clear_hidden_rectangle_pair(digit, opposite_pair, pencil_marks):
-                            return True
-
-    def solve_hidden_rectangle_singles(self, rectangle):
-        for check_cell in rectangle:
-            pencil_marks = check_cell.pencil_marks
-            if len(pencil_marks) == 2:
-                house = {*rectangle} - {check_cell}
-                if all_cells_in_house_contain_pencil_marks(house, pencil_marks):
-                    opposite = {cell
-                                for cell in rectangle
-                                if cell.x != check_cell.x and cell.y != check_cell.y}.pop()
-                    for digit in pencil_marks:
-                        if self.clear_hidden_rectangle_single(digit, check_cell, opposite):
-                            return True
-        return False
+                for a, b in (pair, pair[::-1]):
+                    base = places & HOUSE_BOARDS[CELL_HOUSES[a][1 - kind]]
+                    if base.bit_count() == 1 and places != base:
+                        yield 1 << b | places & ~base
 
-    def solve_proper_fish(self, digit: int, house_type: str, candidates: list[list[Cell]]) -> bool:
+    @staticmethod
+    def find_turbot_fish(graph: LinkGraph, digit: int, kind: str) -> Generator[tuple[int, int], None, None]:
         """
-        Checks for x-wings, swordfish, and jellyfish on digit in candidates.
+        Yield the free ends (a, b) of each pair of strongly connected
+        pairs on digit (c.f. LinkGraph.conjugate_houses) with one cell
+        each which see each other. If kind is "kite", only pairs in a
+        row and a column whose joined cells share a box are used.
+        Otherwise, every such pair of pairs is a turbot fish.
         """
-        size = len(candidates)
-        fish_cells = {cell for group in candidates for cell in group}
-        opposite_axis = LITERALS[house_type]["opposite_axis"]
-        perpendicular_house_nums = {getattr(cell, opposite_axis) for cell in fish_cells}
-        if len(perpendicular_house_nums) == size:
-            return self.clear_proper_fish(digit, fish_cells, perpendicular_house_nums, house_type)
-        return False
+        for (h1, p1), (h2, p2) in combinations(graph.conjugate_houses(digit), r=2):
+            if set(p1) & set(p2):
+                continue
+            if kind == "kite" and not (h1 < 9 <= h2 < 18):
+                continue
+            for (a1, a), (b1, b) in product((p1, p1[::-1]), (p2, p2[::-1])):
+                if not PEER_BOARDS[a1] >> b1 & 1:
+                    continue
+                if kind == "kite" and CELL_HOUSES[a1][2] != CELL_HOUSES[b1][2]:
+                    continue
+                yield a, b
 
-    def strongly_connected_cell_chains(self, pairs: set[tuple[Cell, Cell]]):
+    def find_xyzwings(self) -> Generator[tuple[int, int, int, int], None, None]:
         """
-        Return a list of lists of cells which form a chain of three or
-        more cells that are strongly connected.
+        Yield (pivot, wing, wing, digit) for each XYZ-Wing in
+        self.sudoku, where the pivot and wings are cell indices and
+        digit is the option all three share. Each search starts from a
+        pivot with three options and only looks at the cells it sees
+        whose two options are both options of the pivot.
         """
-        adjacencies: dict = self.strongly_connected_chain_adjacent_cells(pairs)
-        endpoints = {k for k, v in adjacencies.items() if len(v) == 1}
-        if not endpoints:
-            return []
-        return self.match_endpoints_with_adjacencies(adjacencies, endpoints)
-
-    @staticmethod
-    def strongly_connected_chain_adjacent_cells(pairs) -> dict[Cell, set[Cell]]:
-        """Return a dictionary mapping each cell appearing in pairs to each
-        cell it shares a pair with."""
-        flat_cells = {cell for pair in pairs for cell in pair}
-        chain_dict = {
-            cell: set()
-            for cell in flat_cells
-        }
-        for k in chain_dict:
-            pairs_with_k = [set(pair) for pair in pairs if k in pair]
-            for pair in pairs_with_k:
-                chain_dict[k].update(pair - {k})
-        return chain_dict
-
-    @staticmethod
-    def trimmed_fish_houses(candidate_houses, house_type, size) -> Optional[tuple]:
-        """Return group of cells that could be an xwing, swordfish, or jellyfish."""
-        opposite_axis = LITERALS[house_type]["opposite_axis"]
-        for candidates in combinations(candidate_houses, r=size):
-            total_axes = set()
-            for line in candidates:
-                total_axes.update([getattr(cell, opposite_axis) for cell in line])
-            if len(total_axes) == size:
-                return candidates
-        return None
-
-    def unique_rectangle_cell_and_target(self, a, b) -> tuple[Optional[Cell], Optional[Cell]]:
-        """Given cell_a, cell_b that share a row or column in the same box
-        and have identical pencil_marks, return a cell (if any) that shares a
-        column or row (respectively) with one of them and the cell that
-        completes the rectangle."""
-        if a.y == b.y:
-            cell, target = self.unique_rectangle_cell_and_target_share_a_row(a, b)
-        elif a.x == b.x:
-            cell, target = self.unique_rectangle_cell_and_target_share_a_column(a, b)
-        else:
-            return None, None
-        return cell, target
-
-    def unique_rectangle_cell_and_target_share_a_column(self, a, b) -> tuple[Cell, Cell]:
-        final_cell = None
-        target = None
-        for cell in [self.sudoku[k] for k in a.row if k != a.coordinates]:
-            if cell.pencil_marks == a.pencil_marks:
-                target = self.sudoku[(cell.x, b.y)]
-                final_cell = cell
-                break
-        else:
-            for cell in [self.sudoku[k] for k in b.row if k != b.coordinates]:
-                if cell.pencil_marks == a.pencil_marks:
-                    target = self.sudoku[(cell.x, a.y)]
-                    final_cell = cell
-                    break
-        return final_cell, target
-
-    def unique_rectangle_cell_and_target_share_a_row(self, a, b) -> tuple[Cell, Cell]:
-        final_cell = None
-        target = None
-        for cell in [self.sudoku[k] for k in a.column if k != a.coordinates]:
-            if cell.pencil_marks == a.pencil_marks:
-                target = self.sudoku[(b.x, cell.y)]
-                final_cell = cell
-                break
-        else:
-            for cell in [self.sudoku[k] for k in b.column if k != b.coordinates]:
-                if cell.pencil_marks == b.pencil_marks:
-                    target = self.sudoku[(a.x, cell.y)]
-                    final_cell = cell
-                    break
-        return final_cell, target
-
-    @staticmethod
-    def x_wing_if_it_has_fins(fin_house, x_wing_house) -> list:
-        """Return the x-wing hidden inside a finned x-wing if such an x-wing exists."""
-        for fin_0, fin_1 in combinations(fin_house, r=2):
-            checktangle = [
-                x_wing_house[0],
-                fin_0,
-                x_wing_house[1],
-                fin_1
-            ]
-            if Sudoku.cells_form_a_rectangle(*checktangle):
-                return checktangle
-        return []
-
-    def xyzwing_affected_cells(self, shared_digit: int, triple: tuple[Cell, Cell, Cell]) -> list:
-        """
-        Return cells which contain shared_digit and see all three cells
-        in triple.
-        """
-        affected_cells = []
-        if affected_keys := set.intersection(*[cell.visible_cells() for cell in triple]):
-            for key in affected_keys:
-                cell = self.sudoku[key]
-                if shared_digit in cell:
-                    affected_cells.append(cell)
-        return affected_cells
+        bivalues = self.sudoku.bivalues()
+        masks = self.sudoku.masks
+        for pivot, pivot_mask in enumerate(masks):
+            if pivot_mask.bit_count() != 3:
+                continue
+            wings = [peer for peer in PEERS[pivot] if peer in bivalues and not masks[peer] & ~pivot_mask]
+            for a, b in combinations(wings, r=2):
+                if masks[a] != masks[b]:
+                    yield pivot, a, b, (masks[a] & masks[b]).bit_length()
+
+    def find_ywings(self) -> Generator[tuple[int, int, int], None, None]:
+        """
+        Yield (wing, wing, digit) for each Y-Wing in self.sudoku, where
+        the wings are cell indices and digit is the option they share.
+        Each search starts from a pivot with two options and only looks
+        at the cells with two options which it sees.
+        """
+        bivalues = self.sudoku.bivalues()
+        masks = self.sudoku.masks
+        for pivot in bivalues.cells():
+            pivot_mask = masks[pivot]
+            wings = [peer for peer in sorted(bivalues.peers(pivot))
+                     if (masks[peer] & pivot_mask).bit_count() == 1]
+            for a, b in combinations(wings, r=2):
+                shared = masks[a] & masks[b]
+                if shared.bit_count() == 1 and not shared & pivot_mask and not PEER_BOARDS[a] >> b & 1:
+                    yield a, b, shared.bit_length()
 
     @staticmethod
-    def xyzwing_triple_shared_digit(index, triple: tuple[Cell, Cell, Cell]) -> Optional[int]:
-        """Return triple's shared digit if input triple is a viable xyzwing;
-        returns None otherwise."""
-        axis = triple[index]
-        wings = [triple[x] for x in {0, 1, 2} - {index}]
-        if min([axis.sees(cell) for cell in wings]):
-            pencil_marks = [cell.pencil_marks for cell in triple]
-            intersection = set.intersection(*pencil_marks)
-            if len(set.union(*pencil_marks)) == 3 and len(set.intersection(*pencil_marks)) == 1:
-                return intersection.pop()
-        return None
-
-
-def at_least_one_cell_has_only_two_options(*cells) -> bool:
-    return bool([cell
-                 for cell in cells
-                 if len(cell.pencil_marks) == 2])
-
-
-def cells_are_empty(*cells) -> bool:
-    """Return whether each cell in cells is empty."""
-    return min([cell.is_empty for cell in cells])
-
-
-def cells_share_axis(check_axis, *cells: Cell) -> bool:
-    """Return whether input cells all share a row or column.
-    check_axes should be 'x' for column or 'y' for row."""
-    axes = {getattr(cell, check_axis) for cell in cells}
-    return len(axes) == 1
-
-
-def all_cells_in_house_contain_pencil_marks(house: Iterable[Cell], pencil_marks: set[int]) -> bool:
-    """Return whether all cells in cells contain each digit in pencil_marks."""
-    return min([
-        cell.pencil_marks.issuperset(pencil_marks)
-        for cell in house
-    ])
+    def mini_line_eliminations(planes: list[int], kind: str) -> list[tuple[int, int]]:
+        """
+        Return every (index, digit) candidate removed by a digit whose
+        places in a box all lie in one row or column (if kind is
+        "pointing"), or whose places in a row or column all lie in one
+        box (if kind is "claiming"). planes are the digit planes (c.f.
+        Sudoku.update_versions) of the sudoku.
+        """
+        candidates = []
+        for digit, plane in enumerate(planes, start=1):
+            for line, box, mini_line in MINI_LINES:
+                places = plane & mini_line
+                if not places:
+                    continue
+                line_places = plane & HOUSE_BOARDS[line]
+                box_places = plane & HOUSE_BOARDS[box]
+                if kind == "pointing" and box_places == places:
+                    targets = line_places & ~mini_line
+                elif kind == "claiming" and line_places == places:
+                    targets = box_places & ~mini_line
+                else:
+                    continue
+                candidates.extend((index, digit) for index in board_indices(targets))
+        return candidates
 
 
 def list_diff(checked_against: list, check_list: list) -> list:
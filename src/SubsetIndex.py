@@ -0,0 +1,101 @@
+from src.Bitboard import HOUSES
+
+# Largest naked or hidden tuple looked for.
+MAX_TUPLE_SIZE = 4
+
+
+def locked_subsets(masks: list[int], max_size: int = MAX_TUPLE_SIZE) -> list[tuple[int, int]]:
+    """
+    Return (members, union) for each group of 2 to max_size non-empty
+    masks which together have exactly as many bits set as there are
+    masks in the group. Bit i of members is set if masks[i] is in the
+    group, and union is the OR of their masks. Groups are returned in
+    order of size.
+
+    Masks with more than max_size bits are never used, and a group is
+    abandoned as soon as its union has more than max_size bits.
+    """
+    usable = [i for i, mask in enumerate(masks) if mask and mask.bit_count() <= max_size]
+    found = []
+    # Each entry is (next position in usable, members, union, size of members).
+    stack = [(0, 0, 0, 0)]
+    while stack:
+        start, members, union, size = stack.pop()
+        for position in range(start, len(usable)):
+            i = usable[position]
+            new_union = union | masks[i]
+            count = new_union.bit_count()
+            if count > max_size:
+                continue
+            new_members = members | 1 << i
+            if count == size + 1 >= 2:
+                found.append((new_members, new_union))
+            if size + 1 < max_size:
+                stack.append((position + 1, new_members, new_union, size + 1))
+    found.sort(key=lambda group: (group[0].bit_count(), group[0]))
+    return found
+
+
+def naked_subsets(masks: list[int], house: tuple[int, ...]) -> list[tuple[list[int], int]]:
+    """
+    Return (cells, digits) for each naked tuple in house: n cells whose
+    candidate masks (c.f. src.Bitboard) have n digits between them.
+    Only tuples whose digits appear in other cells of the house, and
+    so can be removed from them, are returned.
+    """
+    house_masks = [masks[index] for index in house]
+    found = []
+    for members, union in locked_subsets(house_masks):
+        others = 0
+        for j in range(9):
+            if not members >> j & 1:
+                others |= house_masks[j]
+        if union & others:
+            found.append(([house[j] for j in range(9) if members >> j & 1], union))
+    return found
+
+
+def hidden_subsets(masks: list[int], house: tuple[int, ...]) -> list[tuple[list[int], int]]:
+    """
+    Return (cells, digits) for each hidden tuple in house: n digits
+    whose only places in the house are n cells. This is the same search
+    as for naked tuples, run over the position mask of each digit in
+    the house instead of the candidate mask of each cell. Only tuples
+    whose cells have other options, which can be removed, are returned.
+    """
+    positions = [0] * 9
+    for j, index in enumerate(house):
+        mask = masks[index]
+        while mask:
+            low = mask & -mask
+            positions[low.bit_length() - 1] |= 1 << j
+            mask ^= low
+    found = []
+    for digits, union in locked_subsets(positions):
+        cells = [house[j] for j in range(9) if union >> j & 1]
+        if any(masks[index] & ~digits for index in cells):
+            found.append((cells, digits))
+    return found
+
+
+class SubsetIndex:
+    """
+    The naked and hidden tuples in each house of a sudoku which can
+    remove options from cells.
+
+    The index keeps the house versions (c.f. Sudoku.update_versions) it
+    was last updated with, and update() only searches houses again if
+    they have changed since then.
+    """
+
+    def __init__(self) -> None:
+        self.house_versions: list[int] = [-1] * len(HOUSES)
+        self.naked: list[list[tuple[list[int], int]]] = [[] for _ in HOUSES]
+        self.hidden: list[list[tuple[list[int], int]]] = [[] for _ in HOUSES]
+
+    def update(self, sudoku) -> None:
+        """Bring the index up to date with sudoku (c.f. Sudoku.updated)."""
+        for house in sudoku.changed_houses(self.house_versions):
+            self.naked[house] = naked_subsets(sudoku.masks, HOUSES[house])
+            self.hidden[house] = hidden_subsets(sudoku.masks, HOUSES[house])
+        self.house_versions[:] = sudoku.house_versions
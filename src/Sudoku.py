@@ -1,6 +1,9 @@
-from itertools import product, combinations, permutations
+from itertools import product, permutations
 from typing import ItemsView, KeysView, Iterator, Generator, Iterable
 
+from src import Search
+from src.BivalueIndex import BivalueIndex
+from src.Bitboard import CELL_HOUSES, HOUSE_BOARDS, MASK_DIGITS, digit_bit, digits_mask
 from src.Cell import Cell
 
 RCB_ITER = "rows", "columns", "boxes"
@@ -76,6 +79,19 @@ vdw_index_map = {
 class Sudoku:
     def __init__(self) -> None:
         self.cell_dict = {k: Cell(k) for k in CELL_KEYS}
+        self.bivalue_index = BivalueIndex()
+        # Candidate masks and planes as of the last call to
+        # update_versions(), and how many times each digit's and each
+        # house's candidates have changed.
+        self.masks: list[int] = [0] * 81
+        self.planes: list[int] = [0] * 9
+        self.digit_versions: list[int] = [0] * 9
+        self.house_versions: list[int] = [0] * len(HOUSE_BOARDS)
+        # Scratch space for update_pencil_marks(): the candidate mask of
+        # the digits filled in each house.
+        self.house_digits: list[int] = [0] * len(HOUSE_BOARDS)
+        # Set by use_numpy().
+        self.tensor = None
 
     def __str__(self) -> str:
         blank = "{}{}{}|{}{}{}|{}{}{}\n" \
@@ -127,8 +143,7 @@ class Sudoku:
     def __iter__(self) -> Iterator[Cell]:
         """Iterate over cell objects in the sudoku in the following order of keys:
         (0, 0), (1, 0), (2, 0), ... (8, 0), (0, 1), (1, 1), ... (8, 8)"""
-        for key in CELL_KEYS:
-            yield self[key]
+        return iter(self.cell_dict.values())
 
     @property
     def is_complete(self) -> bool:
@@ -197,15 +212,140 @@ class Sudoku:
             column_digits: set = {self[c].digit for c in cell.column}
             box_digits: set = {self[c].digit for c in cell.box}
             invalid_digits: set = row_digits.union(column_digits, box_digits)
-            cell.pencil_marks -= invalid_digits
+            cell.remove(invalid_digits)
         else:
             cell.pencil_marks = set()
 
     def update_pencil_marks(self) -> None:
         """Update all pencil marks in the puzzle based only on cell/row/box
          logic."""
-        for key in self.keys():
-            self.check_cell_pencil_marks(key)
+        if self.tensor is not None:
+            self.tensor.update_pencil_marks()
+            return
+        filled = self.house_digits
+        for house in range(len(filled)):
+            filled[house] = 0
+        for index, cell in enumerate(self):
+            if not cell.is_empty:
+                bit = 1 << (cell.digit - 1)
+                for house in CELL_HOUSES[index]:
+                    filled[house] |= bit
+        for index, cell in enumerate(self):
+            if cell.is_empty:
+                row, column, box = CELL_HOUSES[index]
+                cell.pencil_marks.difference_update(MASK_DIGITS[filled[row] | filled[column] | filled[box]])
+            elif cell.pencil_marks:
+                cell.pencil_marks = set()
+
+    def use_numpy(self) -> None:
+        """
+        Keep the candidates in a src.CandidateTensor as well, which the
+        cells edit as they are filled, emptied and lose options, and
+        which update_pencil_marks(), update_versions() and Solver's
+        hidden singles then read instead of every cell's pencil marks.
+        Pencil marks must then only be changed through Cell.fill(),
+        Cell.clear() and Cell.remove(). Raise ImportError if NumPy is
+        missing.
+        """
+        from src.CandidateTensor import CandidateTensor
+        self.update_pencil_marks()
+        self.tensor = CandidateTensor(self)
+        for cell in self:
+            cell.tensor = self.tensor
+
+    def candidate_masks(self) -> list[int]:
+        """
+        Return a list of the candidate masks (c.f. src.Bitboard) of
+        each cell in CELL_KEYS order. Filled cells have a mask of 0.
+        """
+        return [digits_mask(cell.pencil_marks) if cell.is_empty else 0 for cell in self]
+
+    def grid_masks(self) -> list[int]:
+        """
+        Return a list of candidate masks in CELL_KEYS order in which
+        filled cells have their digit's bit set, for use with
+        src.Search.
+        """
+        return [digits_mask(cell.pencil_marks) if cell.is_empty else digit_bit(cell.digit)
+                for cell in self]
+
+    def update_versions(self) -> list[int]:
+        """
+        Bump the version of each digit, and of each house, whose
+        candidates have changed since the last call and return the
+        candidate planes: nine boards (c.f. src.Bitboard), the board at
+        d - 1 holding the empty cells which could be digit d. Pencil
+        marks are edited in place, so changes are found by comparing
+        each cell's candidate mask with the one it had then. The masks
+        and planes are kept in self.masks and self.planes, which are
+        updated in place rather than rebuilt.
+        """
+        masks, planes = self.masks, self.planes
+        if self.tensor is not None:
+            current = self.tensor.masks()
+        else:
+            current = (digits_mask(cell.pencil_marks) if cell.is_empty else 0 for cell in self)
+        for index, (old, new) in enumerate(zip(masks, current)):
+            if old != new:
+                for digit in MASK_DIGITS[old ^ new]:
+                    self.digit_versions[digit - 1] += 1
+                    planes[digit - 1] ^= 1 << index
+                for house in CELL_HOUSES[index]:
+                    self.house_versions[house] += 1
+                masks[index] = new
+        return planes
+
+    def changed_houses(self, versions: list[int]) -> list[int]:
+        """
+        Return the houses whose versions (c.f. update_versions()) differ
+        from those in versions, in order.
+        """
+        return [house for house, (old, new) in enumerate(zip(versions, self.house_versions)) if old != new]
+
+    def updated(self, index):
+        """
+        Return index, one of the indexes kept across steps such as
+        src.BivalueIndex or src.LinkGraph, after calling
+        update_versions() and bringing it up to date. Each index only
+        looks again at the houses which have changed since its last
+        update (c.f. changed_houses()).
+        """
+        self.update_versions()
+        index.update(self)
+        return index
+
+    def filled_planes(self) -> list[int]:
+        """
+        Return nine boards, the board at d - 1 holding the cells filled
+        with digit d.
+        """
+        planes = [0] * 9
+        for index, cell in enumerate(self):
+            if not cell.is_empty:
+                planes[cell.digit - 1] |= 1 << index
+        return planes
+
+    def digits(self) -> list[int]:
+        """
+        Return a list of the digit in each cell in CELL_KEYS order, with
+        0 for empty cells.
+        """
+        return [0 if cell.is_empty else cell.digit for cell in self]
+
+    def bivalues(self) -> BivalueIndex:
+        """
+        Return the index of cells with exactly two pencil marks after
+        bringing it up to date with the cells' current pencil marks.
+        """
+        return self.updated(self.bivalue_index)
+
+    def count_solutions(self, limit: int = 2) -> int:
+        """
+        Return the number of ways to complete the sudoku using its
+        filled digits and current pencil marks, stopping the search
+        once limit solutions have been found.
+        """
+        return Search.count_solutions(self.grid_masks(), limit)
 
     def box(self, b) -> list[Cell]:
         """Return the list of cells in box top_right of the Sudoku."""
@@ -213,7 +353,7 @@ class Sudoku:
 
     def row(self, r) -> list[Cell]:
         """Return the list of cells in row r of the Sudoku."""
-        return [self[key] for key in [(c, r) for c in range(9)]]
+        return [self[c, r] for c in range(9)]
 
     def column(self, c) -> list[Cell]:
         """Return the list of cells in column bot_left """
@@ -233,16 +373,6 @@ class Sudoku:
             self[key].started_empty = True
         self.update_pencil_marks()
 
-    def rectangles(self) -> Generator[tuple[Cell, Cell, Cell, Cell], None, None]:
-        """Yield cells arranged in a rectangle."""
-        for row in self.rows:
-            for top_left, top_right in combinations(row, r=2):
-                for bottom_left in [self[key]
-                                    for key in top_left.visible_cells("column")
-                                    if key[1] > top_left.y]:
-                    bottom_right = self[top_right.x, bottom_left.y]
-                    yield top_left, top_right, bottom_left, bottom_right
-
     @staticmethod
     def house_contains_filled_digit(digit: int, house: list[Cell]) -> bool:
         """Return whether input house of self contains input digit."""
@@ -252,11 +382,11 @@ class Sudoku:
     def houses_with_digit(self, house_type: str, digit: int) -> Generator[list[Cell], None, None]:
         iter_house_type = house_type + "s"
         for house in getattr(self, iter_house_type):
-            if len([cell for cell in house if digit in cell]):
+            if any(digit in cell for cell in house):
                 yield house
 
     @classmethod
-    def from_string(cls, string: str, edited: dict = None) -> "Sudoku":
+    def from_string(cls, string: str, edited: dict = None, unique: bool = False) -> "Sudoku":
         """
         Return a sudoku whose cells in order appear in an 81-character
         string. Spaces mark empty cells, and the \n character can be
@@ -264,6 +394,9 @@ class Sudoku:
 
         If edited is supplied, then for each key in edited, remove all
         digits in edited[key] from sudoku[key].
+
+        If unique is True, raise a ValueError unless the digits in the
+        string have exactly one solution.
         """
         string = string.replace("\n", "")
         if len(string) < 81:
@@ -280,6 +413,12 @@ class Sudoku:
         if not new.is_legal():
             coordinates = new.is_legal(return_cell=True)
             raise ValueError(f"Your sudoku contains a duplicate at {coordinates}.")
+        if unique:
+            solutions = new.count_solutions()
+            if solutions == 0:
+                raise ValueError("Your sudoku has no solution.")
+            elif solutions > 1:
+                raise ValueError("Your sudoku has more than one solution.")
         if edited is not None:
             new.post_init(edited)
         new.update_pencil_marks()
@@ -342,7 +481,7 @@ class Sudoku:
         :param bot_row: row 6, 7, 8: int in range(6, 9) or None
         :return: Two sets containing identical digits if no params are None, otherwise return a list of such sets.
         """
-        if min([isinstance(param, int) for param in (left_col, right_col, top_row, bot_row)]):
+        if all(isinstance(param, int) for param in (left_col, right_col, top_row, bot_row)):
             return self.single_phistomefel_set(left_col, right_col, top_row, bot_row)
 
         lc = [left_col] if left_col is not None else range(3)
@@ -501,7 +640,7 @@ class Sudoku:
 
     def vdw_squares(self, vertical=None, horizontal=None) -> \
             list[tuple[set[Cell], set[Cell]]] | tuple[set[Cell], set[Cell]]:
-        if min(isinstance(vertical, str), isinstance(horizontal, str)) is True:
+        if isinstance(vertical, str) and isinstance(horizontal, str):
             return self.single_vdw_square(vertical, horizontal)
 
         verticals = "top", "bottom" if vertical is None else [vertical]
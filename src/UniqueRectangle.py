@@ -0,0 +1,234 @@
+"""
+Unique rectangles, found with candidate masks (c.f. src.Bitboard).
+
+Four cells in a rectangle spanning two boxes which could only be two
+digits, x and y, would form a deadly pattern: x and y could be swapped
+in them to give a second solution. A sudoku with one solution can't
+contain one, so whenever a rectangle is close to being deadly, the
+options which would complete the pattern can be removed.
+
+Corners whose only options are x and y are called the floor, and the
+other corners, which have extra options, are called the roof.
+
+    Type 1:  three corners are the floor, so the roof can't be x or y.
+    Type 2:  the roof has one extra option z, which must be in one of
+             its cells, so z can be removed from cells which see them
+             all. If the roof lies along a diagonal, this is type 5.
+    Type 3:  the extra options of two roof cells in one house act as a
+             single cell, which can form a naked tuple with other cells
+             in that house.
+    Type 4:  two roof cells in one house are the only places there for
+             x, so neither of them can be y.
+    Type 6:  the floor lies along a diagonal and x can only be in the
+             rectangle in both of its rows or both of its columns, so
+             the roof can't be x.
+    Hidden:  x can only be in the rectangle in the row and column of
+             the corner opposite a floor cell, so that corner can't be
+             y.
+
+Avoidable rectangles are the same idea applied to digits which have
+already been filled in, as long as none of them were given.
+"""
+from typing import Generator
+
+from src.Bitboard import CELL_HOUSES, CELL_RECTANGLES, HOUSE_BOARDS, HOUSES, RECTANGLES, board_indices, \
+    mask_digits, rectangles_where, seen_by_all
+from src.SubsetIndex import locked_subsets
+
+# Types looked for by Solver.check_for_unique_rectangle and, since they
+# rely on strong links, by Solver.check_for_hidden_rectangle.
+UNIQUE_TYPES = "1", "2", "3", "5", "6"
+HIDDEN_TYPES = "4", "hidden"
+
+
+def deadly_pair(a: int, b: int, c: int, d: int) -> int:
+    """
+    Return the mask of the two digits which every corner of a rectangle,
+    with candidate masks a, b, c and d, could be, if at least one corner
+    can only be those two and every such corner has the same pair.
+    Otherwise, return 0.
+    """
+    pair = 0
+    for mask in (a, b, c, d):
+        if mask.bit_count() == 2:
+            if pair and mask != pair:
+                return 0
+            pair = mask
+    return pair if a & b & c & d & pair == pair else 0
+
+
+class RectangleIndex:
+    """
+    The rectangles of a sudoku which could become deadly patterns,
+    grouped by the pair of digits (c.f. deadly_pair()) which would make
+    them deadly.
+
+    The index keeps the candidate masks, planes and house versions (c.f.
+    Sudoku.update_versions) it was last updated with, and update() only
+    looks again at rectangles with a corner in a row which has changed
+    since then. Any change to a cell changes its row, so this covers
+    every rectangle which might have changed. Deadly pairs need a
+    bivalue corner, so only the rectangles of cells in the bivalue
+    index (c.f. Sudoku.bivalues) are checked.
+    """
+
+    def __init__(self) -> None:
+        self.masks: list[int] = [0] * 81
+        self.planes: list[int] = [0] * 9
+        self.house_versions: list[int] = [-1] * len(HOUSES)
+        self.pair_of: dict[tuple[int, int, int, int], int] = {}
+        self.by_pair: dict[int, set[tuple[int, int, int, int]]] = {}
+
+    def update(self, sudoku) -> None:
+        """Bring the index up to date with sudoku (c.f. Sudoku.updated)."""
+        masks = sudoku.masks
+        cells = [index for house in sudoku.changed_houses(self.house_versions) if house < 9 for index in HOUSES[house]]
+        for index in cells:
+            for number in CELL_RECTANGLES[index]:
+                if RECTANGLES[number] in self.pair_of:
+                    self.remove(RECTANGLES[number])
+        for corners in rectangles_where(masks, deadly_pair, sudoku.bivalues(), cells):
+            self.add(corners, deadly_pair(*(masks[i] for i in corners)))
+        self.masks = masks
+        self.planes = sudoku.planes
+        self.house_versions[:] = sudoku.house_versions
+
+    def add(self, corners: tuple[int, int, int, int], pair: int) -> None:
+        self.pair_of[corners] = pair
+        self.by_pair.setdefault(pair, set()).add(corners)
+
+    def remove(self, corners: tuple[int, int, int, int]) -> None:
+        pair = self.pair_of.pop(corners)
+        group = self.by_pair[pair]
+        group.discard(corners)
+        if not group:
+            del self.by_pair[pair]
+
+    def pairs(self) -> list[int]:
+        """Return each pair which would make at least one rectangle deadly."""
+        return sorted(self.by_pair)
+
+    def with_pair(self, pair: int) -> list[tuple[int, int, int, int]]:
+        """Return the corners of the rectangles which pair would make deadly."""
+        return sorted(self.by_pair.get(pair, ()))
+
+
+def find_unique_rectangles(index: RectangleIndex,
+                           types: tuple[str, ...]) -> Generator[tuple[str, list[tuple[int, int]]], None, None]:
+    """
+    Yield (type, candidates) for each unique rectangle of one of types
+    in index, pair by pair, where candidates are the (index, digit)
+    pairs which it removes. Rectangles which would remove nothing are
+    skipped.
+    """
+    masks, planes = index.masks, index.planes
+    for pair in index.pairs():
+        for corners in index.with_pair(pair):
+            for kind, candidates in rectangle_eliminations(masks, planes, pair, corners, types):
+                if candidates:
+                    yield kind, candidates
+
+
+def rectangle_eliminations(masks: list[int], planes: list[int], pair: int, corners: tuple[int, int, int, int],
+                           types: tuple[str, ...]) -> Generator[tuple[str, list[tuple[int, int]]], None, None]:
+    """
+    Yield (type, candidates) for each way of one of types that the
+    rectangle with corners, which pair would make deadly, can remove
+    options. planes are the digit planes (c.f.
+    Sudoku.update_versions) of masks.
+    """
+    floor = [i for i in corners if masks[i] == pair]
+    roof = [i for i in corners if masks[i] != pair]
+    roof_board = sum(1 << i for i in roof)
+    outside = ~sum(1 << i for i in corners)
+    houses = shared_houses(roof)
+    digits = mask_digits(pair)
+
+    if len(roof) == 1 and "1" in types:
+        yield "1", [(roof[0], digit) for digit in digits]
+
+    extras = {masks[i] & ~pair for i in roof}
+    if len(roof) > 1 and len(extras) == 1 and (extra := extras.pop()).bit_count() == 1:
+        z = extra.bit_length()
+        if (kind := "2" if houses else "5") in types:
+            targets = seen_by_all(roof_board) & planes[z - 1]
+            yield kind, [(i, z) for i in board_indices(targets)]
+
+    if len(roof) == 2 and houses and "3" in types:
+        yield "3", naked_tuple_eliminations(masks, pair, roof, houses)
+
+    if len(roof) == 2 and houses and "4" in types:
+        for house in houses:
+            for x, y in (digits, digits[::-1]):
+                if planes[x - 1] & HOUSE_BOARDS[house] == roof_board:
+                    yield "4", [(i, y) for i in roof]
+
+    if len(roof) == 2 and not houses and "6" in types:
+        rows = {CELL_HOUSES[i][0] for i in corners}
+        columns = {CELL_HOUSES[i][1] for i in corners}
+        for x in digits:
+            plane = planes[x - 1] & outside
+            if not any(plane & HOUSE_BOARDS[h] for h in rows) or not any(plane & HOUSE_BOARDS[h] for h in columns):
+                yield "6", [(i, x) for i in roof]
+
+    if "hidden" not in types:
+        return
+    for k, corner in enumerate(corners):
+        opposite = corners[3 - k]
+        if corner not in floor or opposite in floor:
+            continue
+        row, column = CELL_HOUSES[opposite][:2]
+        for x, y in (digits, digits[::-1]):
+            if not planes[x - 1] & outside & (HOUSE_BOARDS[row] | HOUSE_BOARDS[column]):
+                yield "hidden", [(opposite, y)]
+
+
+def shared_houses(cells: list[int]) -> list[int]:
+    """Return the houses, in order, which contain every cell in cells."""
+    return sorted(set.intersection(*(set(CELL_HOUSES[i]) for i in cells)))
+
+
+def naked_tuple_eliminations(masks: list[int], pair: int, roof: list[int],
+                             houses: list[int]) -> list[tuple[int, int]]:
+    """
+    Return the candidates removed by the first naked tuple which the
+    extra options of the two roof cells form, as if they were one cell,
+    with other cells in one of houses.
+    """
+    extra = (masks[roof[0]] | masks[roof[1]]) & ~pair
+    for house in houses:
+        others = [i for i in HOUSES[house] if i not in roof]
+        for members, union in locked_subsets([extra] + [masks[i] for i in others]):
+            if not members & 1:
+                continue
+            candidates = [
+                (i, digit)
+                for j, i in enumerate(others) if not members >> (j + 1) & 1
+                for digit in mask_digits(masks[i] & union)
+            ]
+            if candidates:
+                return candidates
+    return []
+
+
+def avoidable_eliminations(masks: list[int], grid: list[int],
+                           givens: int) -> Generator[list[tuple[int, int]], None, None]:
+    """
+    Yield the candidates removed by each avoidable rectangle: three
+    filled cells and one empty cell in a rectangle, none of them given,
+    whose filled diagonal holds the same digit twice. The empty cell
+    can't be the digit in its opposite corner, or those two digits
+    could be swapped.
+
+    masks are the candidate masks of the sudoku, grid its grid masks
+    (c.f. Sudoku.grid_masks) and givens the board of its given cells.
+    """
+    for corners in RECTANGLES:
+        empty = [k for k, i in enumerate(corners) if masks[i]]
+        if len(empty) != 1 or any(givens >> i & 1 for i in corners):
+            continue
+        k = empty[0]
+        opposite = corners[3 - k]
+        a, b = (corners[j] for j in range(4) if j not in (k, 3 - k))
+        if grid[a] == grid[b] and masks[corners[k]] & grid[opposite]:
+            yield [(corners[k], grid[opposite].bit_length())]
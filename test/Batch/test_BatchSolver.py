@@ -0,0 +1,76 @@
+import unittest
+
+from src.Batch import BatchSolver, np
+from src.Sudoku import Sudoku
+
+EASY = "    3527 " \
+       " 4 67  3 " \
+       "738   5  " \
+       "     2 84" \
+       "8 37946 5" \
+       " 9       " \
+       " 5 8   9 " \
+       " 8  467 1" \
+       "91 2  8  "
+
+HARD = " 725 3 4 " \
+       "3  8  5  " \
+       "1  7   2 " \
+       " 2     1 " \
+       "6 9 1 3  " \
+       "7 3     9" \
+       "2      5 " \
+       "    7   1" \
+       "    5  3 "
+
+HARD_SOLUTION = "872593146346821597195746823428937615659418372713265489231689754584372961967154238"
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchSolver(unittest.TestCase):
+    def test_batch_solves_easy_puzzles_in_lockstep(self):
+        batch = BatchSolver([EASY, HARD, EASY])
+        batch.run()
+        grids = batch.strings()
+
+        self.assertNotIn(" ", grids[0])
+        self.assertEqual(grids[0], grids[2])
+        self.assertEqual([1], batch.stalled())
+        self.assertFalse(batch.broken().any())
+
+    def test_batch_keeps_candidates_consistent(self):
+        batch = BatchSolver([HARD])
+        batch.run()
+        for i, (digit, mask) in enumerate(zip(batch.grids[0].tolist(), batch.masks[0].tolist())):
+            solution = int(HARD_SOLUTION[i])
+            if digit:
+                self.assertEqual(solution, digit)
+            else:
+                self.assertTrue(mask >> (solution - 1) & 1)
+
+    def test_stalled_puzzles_are_handed_to_solver(self):
+        batch = BatchSolver([HARD])
+        batch.run()
+        sudoku = batch.sudoku(0)
+
+        self.assertIsInstance(sudoku, Sudoku)
+        self.assertEqual(batch.strings()[0], "".join(" " if cell.is_empty else str(cell.digit) for cell in sudoku))
+        self.assertEqual([HARD_SOLUTION], batch.solve())
+
+    def test_broken_puzzles_are_not_stalled(self):
+        batch = BatchSolver(["12345678 " "        9" + " " * 63])
+        batch.run()
+
+        self.assertTrue(batch.broken()[0])
+        self.assertEqual([], batch.stalled())
+
+
+@unittest.skipUnless(np is None, "NumPy is installed")
+class TestBatchSolverWithoutNumPy(unittest.TestCase):
+    def test_batch_solver_needs_numpy(self):
+        with self.assertRaises(ImportError):
+            BatchSolver([EASY])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+If ALS A and ALS B each share a restricted common digit with ALS C,
+x and y respectively, then C can't lose both x and y, so one of A and
+B is locked. Any other digit z shared by A and B must be in one of
+them, so cells which see every z in both cannot contain z.
+"""
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "4 1  7   " \
+           "3  1     " \
+           "  94 3 6 " \
+           "853746219" \
+           "1975286  " \
+           "642319 7 " \
+           "   93   6" \
+           "  6874 9 " \
+           "9    1 8 "
+
+EDITED = {
+    (6, 0): {5},
+    (8, 0): {5},
+    (1, 1): {8, 2},
+    (6, 1): {5},
+    (8, 1): {2, 5},
+    (6, 2): {5},
+    (8, 2): {5},
+    (0, 6): {5},
+    (6, 6): {5},
+    (7, 6): {5},
+    (1, 8): {2}
+}
+
+
+class TestALSXYWing(unittest.TestCase):
+    def test_solver_clears_als_xy_wing(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        cleared_cell = (7, 0)
+        cleared_digit = 2
+
+        self.assertTrue(solver.check_for_als_xy_wing())
+
+        self.assertFalse(cleared_digit in sudoku[cleared_cell].pencil_marks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+An almost locked set (ALS) is n cells in a house which have n + 1
+options between them. If two ALSs share a digit x which every cell in
+either of them that can be x sees, then only one of them can contain x,
+so the other is locked. Any other digit z they share must then be in
+one of them, so cells which see every z in both cannot contain z.
+"""
+
+import unittest
+
+from src.ALSIndex import find_almost_locked_sets
+from src.Bitboard import HOUSES, digits_mask
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "312 98  5" \
+           "54632 98 " \
+           "9876   2 " \
+           "1      4 " \
+           "62   4   " \
+           "4     85 " \
+           "2       8" \
+           "7  8625 4" \
+           "8 45  29 "
+
+EDITED = {
+    (2, 3): {5},
+    (4, 3): {5},
+    (6, 3): {3},
+    (8, 3): {3},
+    (2, 4): {9, 3},
+    (4, 4): {1, 3, 7},
+    (5, 5): {1, 7},
+    (8, 5): {3},
+    (1, 6): {9},
+    (2, 6): {9},
+    (5, 6): {1, 7},
+    (8, 8): {3}
+}
+
+
+class TestALSXZ(unittest.TestCase):
+    def test_solver_clears_als_xz(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        cleared_cell = (5, 5)
+        cleared_digit = 9
+
+        self.assertTrue(solver.check_for_als_xz())
+
+        self.assertFalse(cleared_digit in sudoku[cleared_cell].pencil_marks)
+
+    def test_find_almost_locked_sets(self):
+        masks = [0] * 81
+        row = HOUSES[0]
+        masks[row[0]] = digits_mask({1, 2})
+        masks[row[1]] = digits_mask({2, 3})
+        masks[row[2]] = digits_mask({1, 2, 3, 4})
+        expected = {
+            (1 << row[0], digits_mask({1, 2})),
+            (1 << row[1], digits_mask({2, 3})),
+            (1 << row[0] | 1 << row[1], digits_mask({1, 2, 3}))
+        }
+        self.assertEqual(expected, set(find_almost_locked_sets(masks, row)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+If every empty cell has exactly two options except for one cell with
+three, and every option appears exactly twice in each house except for
+one digit which appears three times in each house of the cell with
+three options, then that cell must be that digit. Otherwise the sudoku
+would be a Bivalue Universal Grave, which has either no solutions or
+more than one.
+"""
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "87 59   6" \
+           "  68  597" \
+           " 957 68  " \
+           "  89 76 5" \
+           "659  8 7 " \
+           "7   65 89" \
+           "   68975 " \
+           "58  7 96 " \
+           "967 5   8"
+
+EDITED = {
+    (2, 0): {1, 3},
+    (5, 0): {2, 4},
+    (6, 0): {3, 4},
+    (7, 0): {1, 2},
+    (0, 1): {2, 4},
+    (1, 1): {1, 2},
+    (4, 1): {3, 4},
+    (5, 1): {3},
+    (0, 2): {3, 4},
+    (4, 2): {1, 2},
+    (7, 2): {3, 4},
+    (8, 2): {1, 2},
+    (0, 3): {1, 2},
+    (1, 3): {3, 4},
+    (4, 3): {1, 2},
+    (7, 3): {3, 4},
+    (3, 4): {2, 3},
+    (4, 4): {3, 4},
+    (6, 4): {1, 2},
+    (8, 4): {1, 4},
+    (1, 5): {2, 3},
+    (2, 5): {1, 4},
+    (3, 5): {1, 4},
+    (6, 5): {2, 3},
+    (0, 6): {1, 3},
+    (1, 6): {1, 4},
+    (2, 6): {2, 4},
+    (8, 6): {2, 3},
+    (2, 7): {2, 3},
+    (3, 7): {1, 2},
+    (5, 7): {1, 4},
+    (8, 7): {3, 4},
+    (3, 8): {3, 4},
+    (5, 8): {2, 3},
+    (6, 8): {1, 4},
+    (7, 8): {1, 2}
+}
+
+
+class TestBUGPlusOne(unittest.TestCase):
+    def test_solver_fills_bug_plus_one(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        filled_key = (5, 1)
+        filled_digit = 1
+
+        self.assertTrue(solver.check_for_bug_plus_one())
+
+        self.assertEqual(filled_digit, sudoku[filled_key].digit)
+
+    def test_solver_ignores_cells_with_more_options(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        solver = Solver(sudoku)
+
+        self.assertFalse(solver.check_for_bug_plus_one())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -32,7 +32,6 @@ class TestPointingRectangle(unittest.TestCase):
         edited = {
             (3, 0): set(),
             (5, 0): set(),
-            (7, 0): {1},
             (0, 1): set(),
             (2, 1): {4},
             (4, 1): set(),
@@ -74,6 +73,8 @@ class TestPointingRectangle(unittest.TestCase):
         for digit in digits:
             self.assertFalse(digit in sudoku[affected_key].pencil_marks)
 
+        self.assertFalse(solver.check_for_pointing_rectangle())
+
     def test_solver_clears_pointing_rectangle_with_pair_in_two_boxes(self):
         sudoku = Sudoku.from_string(UNSOLVED_CROSS)
         solver = Solver(sudoku)
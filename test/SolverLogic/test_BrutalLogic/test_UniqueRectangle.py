@@ -1,7 +1,9 @@
 import unittest
 
+from src.Bitboard import INDEX
 from src.Solver import Solver
 from src.Sudoku import Sudoku
+from src.UniqueRectangle import HIDDEN_TYPES, UNIQUE_TYPES, RectangleIndex, find_unique_rectangles
 
 UNSOLVED = "46 7 8 3 " \
            " 7  93468" \
@@ -45,5 +47,116 @@ class TestUniqueRectangle(unittest.TestCase):
             self.assertFalse(digit in sudoku[changed_key].pencil_marks)
 
 
+TYPE_2 = "   21  48" \
+         "   67    " \
+         " 915  2 7" \
+         "         " \
+         "3 7      " \
+         "8      92" \
+         "   9    6" \
+         " 4 82   3" \
+         "16 3   84"
+
+TYPE_3 = "491827563" \
+         "723569 8 " \
+         "586 3  7 " \
+         " 5  4   7" \
+         "   285   " \
+         " 14 76 5 " \
+         "  5 1  98" \
+         "1 9758   " \
+         " 3  9  1 "
+
+TYPE_6 = "         " \
+         " 74   5 2" \
+         "132   6  " \
+         "    3492 " \
+         "39 251  8" \
+         "24    31 " \
+         "4 9   8  " \
+         "8631492  " \
+         "725368149"
+
+TYPE_5 = " 725 3 4 " \
+         "3  8  5  " \
+         "1  7   2 " \
+         " 2     1 " \
+         "6 9 1 3  " \
+         "7 3     9" \
+         "2      5 " \
+         "    7   1" \
+         "    5  3 "
+
+TYPE_5_EDITED = {
+    (0, 3): {8},
+    (0, 7): {9},
+    (2, 7): {6, 8}
+}
+
+
+class TestUniqueRectangleTypes(unittest.TestCase):
+    def test_solver_clears_type_2(self):
+        sudoku = Sudoku.from_string(TYPE_2)
+        solver = Solver(sudoku)
+        # (8, 3) and (8, 4) are 1 or 5, and (1, 3) and (1, 4) are 1, 2
+        # or 5, so one of (1, 3) and (1, 4) must be 2.
+        cleared_keys = {(1, 1), (0, 3), (2, 3), (1, 6)}
+
+        self.assertTrue(solver.check_for_unique_rectangle())
+
+        for key in cleared_keys:
+            self.assertFalse(2 in sudoku[key].pencil_marks)
+
+    def test_solver_clears_type_3(self):
+        sudoku = Sudoku.from_string(TYPE_3)
+        solver = Solver(sudoku)
+        # (6, 1) and (8, 1) are 1 or 4, so one of (6, 4) and (8, 4) is 3,
+        # 6 or 9, which forms a naked quad on 3, 6, 7 and 9 with (0, 4),
+        # (1, 4) and (2, 4).
+        self.assertTrue(solver.check_for_unique_rectangle())
+
+        self.assertFalse(3 in sudoku[(7, 4)].pencil_marks)
+
+    def test_solver_clears_type_5(self):
+        sudoku = Sudoku.from_string(TYPE_5, TYPE_5_EDITED)
+        solver = Solver(sudoku)
+        # (0, 3) and (2, 7) are 4 or 5, and (2, 3) and (0, 7) are 4, 5
+        # or 8, so one of those two, which lie on a diagonal, must be 8.
+        cleared_keys = {(2, 6), (2, 8)}
+
+        # No other type of rectangle removes anything.
+        index = sudoku.updated(RectangleIndex())
+        self.assertEqual([("5", [(INDEX[(2, 6)], 8), (INDEX[(2, 8)], 8)])],
+                         list(find_unique_rectangles(index, UNIQUE_TYPES + HIDDEN_TYPES)))
+        self.assertTrue(solver.check_for_unique_rectangle())
+
+        for key in cleared_keys:
+            self.assertFalse(8 in sudoku[key].pencil_marks)
+
+    def test_solver_clears_type_6(self):
+        sudoku = Sudoku.from_string(TYPE_6, {(7, 6): {5, 7}, (8, 6): {5, 7}})
+        solver = Solver(sudoku)
+        # (5, 2) and (3, 6) are 5 or 7, and rows 2 and 6 can only be 5
+        # in columns 3 and 5.
+        cleared_keys = {(3, 2), (5, 6)}
+
+        self.assertTrue(solver.check_for_unique_rectangle())
+
+        for key in cleared_keys:
+            self.assertFalse(5 in sudoku[key].pencil_marks)
+
+    def test_rectangle_index_follows_candidate_changes(self):
+        sudoku = Sudoku.from_string(TYPE_2)
+        index = RectangleIndex()
+        sudoku.updated(index)
+        corners = tuple(INDEX[key] for key in [(1, 3), (8, 3), (1, 4), (8, 4)])
+        self.assertIn(0b10001, index.pairs())
+        self.assertIn(corners, index.with_pair(0b10001))
+
+        sudoku[(1, 4)].pencil_marks.remove(5)
+        sudoku.updated(index)
+        self.assertNotIn(corners, index.with_pair(0b10001))
+
+
 if __name__ == '__main__':
     unittest.main()
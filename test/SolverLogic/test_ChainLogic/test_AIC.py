@@ -0,0 +1,44 @@
+"""
+Candidates are strongly linked if at least one of them is true, and
+weakly linked if at most one of them is true. In a chain of candidates
+that alternates between strong and weak links and begins and ends with
+a strong link, at least one of the ends is true, so any candidate
+weakly linked to both ends is false.
+"""
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "915  46 8" \
+           " 639  4  " \
+           " 24 61 9 " \
+           "682 93 4 " \
+           "35914  62" \
+           "14762 9  " \
+           "298  6  4" \
+           "5364    9" \
+           "471  9 56"
+
+EDITED = {
+    (5, 1): {8, 7},
+    (5, 7): {8},
+    (7, 7): {2}
+}
+
+
+class TestAlternatingInferenceChain(unittest.TestCase):
+    def test_solver_clears_aic(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        cleared_cell = (3, 0)
+        cleared_digit = 7
+
+        self.assertTrue(solver.check_for_aic())
+
+        self.assertFalse(cleared_digit in sudoku[cleared_cell].pencil_marks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+If a chain of cells alternates between strong links on a digit (the
+only two places for it in a house) and weak links (cells that see each
+other), and begins and ends with a strong link, then one of its ends
+contains the digit. Cells which see both ends cannot contain it.
+"""
+
+import unittest
+
+from src.LinkGraph import LinkGraph
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "  26 9175" \
+           "  541   3" \
+           "61 52 894" \
+           "3   54   " \
+           "  4 7 3  " \
+           "7   6  4 " \
+           " 8 2 6 31" \
+           "     14  " \
+           "1 67 5   "
+
+EDITED = {
+    (2, 3): {9},
+    (0, 4): {8},
+    (2, 5): {9},
+    (0, 6): {9},
+    (6, 6): {9},
+    (0, 7): {9},
+    (1, 7): {3, 9},
+    (2, 7): {7},
+    (3, 7): {9},
+    (4, 7): {3},
+    (7, 7): {2, 8},
+    (8, 7): {2, 8, 9},
+    (1, 8): {2, 9},
+    (4, 8): {8, 9}
+}
+
+
+class TestXChain(unittest.TestCase):
+    def test_solver_clears_x_chain(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        cleared_key = (0, 4)
+        cleared_digit = 5
+
+        self.assertTrue(solver.check_for_x_chain())
+
+        self.assertFalse(cleared_digit in sudoku[cleared_key])
+
+
+class TestLinkGraph(unittest.TestCase):
+    def test_update_reindexes_changed_houses(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        graph = LinkGraph()
+        sudoku.updated(graph)
+        for digit in range(1, 10):
+            expected = {tuple(sorted(9 * cell.y + cell.x for cell in pair))
+                        for pair in sudoku.strongly_connected_pairs_with_digit(digit)}
+            self.assertEqual(expected, {tuple(sorted(pair)) for pair in graph.conjugate_pairs(digit)})
+
+        sudoku[(0, 4)].remove(5)
+        sudoku.updated(graph)
+        expected = {tuple(sorted(9 * cell.y + cell.x for cell in pair))
+                    for pair in sudoku.strongly_connected_pairs_with_digit(5)}
+        self.assertEqual(expected, {tuple(sorted(pair)) for pair in graph.conjugate_pairs(5)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+If a chain of cells with two options each links every cell to the next
+by a shared digit, and the cells that are linked see each other, then
+whichever option the first cell takes, either it or the last cell
+contains the digit that doesn't link the first cell to the chain. If
+that digit is the same at both ends, cells which see both ends cannot
+contain it.
+"""
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "1496 835 " \
+           " 371   48" \
+           " 8243  9 " \
+           " 612 4583" \
+           "45381    " \
+           " 28563  4" \
+           "876351429" \
+           "3957428  " \
+           "214986735"
+
+EDITED = {
+    (8, 4): {7}
+}
+
+
+class TestXYChain(unittest.TestCase):
+    def test_solver_clears_xy_chain(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        cleared_cell = (8, 0)
+        cleared_digit = 2
+
+        self.assertTrue(solver.check_for_xy_chain())
+
+        self.assertFalse(cleared_digit in sudoku[cleared_cell].pencil_marks)
+
+
+if __name__ == '__main__':
+    unittest.main()
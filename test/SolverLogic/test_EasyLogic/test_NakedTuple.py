@@ -291,5 +291,17 @@ class TestNakedBoxTuples(unittest.TestCase):
                 self.assertTrue(digit in quadruple_options)
 
 
+class TestSubsetIndex(unittest.TestCase):
+    def test_index_drops_tuples_with_nothing_to_clear(self):
+        sudoku: Sudoku = Sudoku.from_string(ROW_PAIR)
+        solver: Solver = Solver(sudoku)
+        # Cell indices of (4, 8) and (5, 8) in row 8.
+        naked_pair = ([76, 77], 0b100000100)
+
+        self.assertIn(naked_pair, sudoku.updated(solver.subset_index).naked[8])
+        self.assertTrue(solver.check_for_naked_tuple())
+        self.assertNotIn(naked_pair, sudoku.updated(solver.subset_index).naked[8])
+
+
 if __name__ == '__main__':
     unittest.main()
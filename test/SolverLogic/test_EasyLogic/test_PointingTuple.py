@@ -7,6 +7,7 @@ cells in that row or column.
 
 import unittest
 
+from src.Bitboard import KEYS, digit_planes
 from src.Solver import Solver
 from src.Sudoku import Sudoku
 
@@ -55,6 +56,18 @@ class TestPointingTuple(unittest.TestCase):
         for key in pointing_tuple:
             self.assertTrue(digit in sudoku[key].pencil_marks)
 
+    def test_solver_clears_every_pointing_tuple_at_once(self) -> None:
+        sudoku: Sudoku = Sudoku.from_string(UNSOLVED_ROW)
+        solver: Solver = Solver(sudoku)
+        planes = digit_planes(sudoku.candidate_masks())
+        candidates = solver.mini_line_eliminations(planes, "pointing")
+        self.assertGreater(len({digit for _, digit in candidates}), 1)
+
+        self.assertTrue(solver.check_for_pointing_tuple())
+
+        for index, digit in candidates:
+            self.assertFalse(digit in sudoku[KEYS[index]].pencil_marks)
+
     def test_solver_clears_pencil_marks_in_col(self) -> None:
         sudoku: Sudoku = Sudoku.from_string(UNSOLVED_COL)
         solver: Solver = Solver(sudoku)
@@ -0,0 +1,78 @@
+"""
+One of the options in a cell must be its digit, and a digit must go in
+one of the cells of a house that can contain it. If following the
+singles from every one of those possibilities removes the same pencil
+mark, then that pencil mark can be removed.
+"""
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+CELL_UNSOLVED = " 15  24  " \
+                "7    452 " \
+                " 24    7 " \
+                "8 9 2 1  " \
+                " 7   1  2" \
+                "1 248 7  " \
+                "591248637" \
+                "   6    5" \
+                "    35   "
+
+CELL_EDITED = {
+    (3, 1): {8},
+    (8, 1): {8},
+    (4, 2): {9},
+    (3, 4): {3},
+    (0, 8): {4},
+    (8, 8): {1}
+}
+
+UNIT_UNSOLVED = " 7 31  2 " \
+                "382769415" \
+                "1      7 " \
+                "  36  1  " \
+                " 69  1   " \
+                "217  8 6 " \
+                " 3 1267  " \
+                "6 8  7231" \
+                "721  3   "
+
+UNIT_EDITED = {
+    (6, 2): {8},
+    (8, 2): {8},
+    (8, 3): {8, 9, 4},
+    (8, 4): {8, 3, 4},
+    (6, 8): {8},
+    (7, 8): {8},
+    (8, 8): {8}
+}
+
+
+class TestCellForcingChain(unittest.TestCase):
+    def test_solver_clears_cell_forcing_chain(self):
+        sudoku = Sudoku.from_string(CELL_UNSOLVED, CELL_EDITED)
+        solver = Solver(sudoku)
+        cleared = {(3, 0): {7}, (4, 0): {6, 9}, (4, 7): {7}}
+
+        self.assertTrue(solver.check_for_cell_forcing_chain())
+
+        for key, digits in cleared.items():
+            self.assertFalse(digits & sudoku[key].pencil_marks)
+
+
+class TestUnitForcingChain(unittest.TestCase):
+    def test_solver_clears_unit_forcing_chain(self):
+        sudoku = Sudoku.from_string(UNIT_UNSOLVED, UNIT_EDITED)
+        solver = Solver(sudoku)
+        cleared = {(0, 0): {4}, (2, 0): {4}, (3, 2): {4}, (4, 2): {4}, (5, 0): {5}, (5, 2): {4}, (5, 3): {4}}
+
+        self.assertTrue(solver.check_for_unit_forcing_chain())
+
+        for key, digits in cleared.items():
+            self.assertFalse(digits & sudoku[key].pencil_marks)
+
+
+if __name__ == '__main__':
+    unittest.main()
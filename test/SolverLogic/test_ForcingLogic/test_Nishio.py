@@ -0,0 +1,59 @@
+"""
+If filling a cell with a digit and following the naked and hidden
+singles that result leaves some cell or house with nowhere to go, then
+the cell cannot contain that digit.
+"""
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "14   3 2 " \
+           "8    135 " \
+           "7 3   146" \
+           "  73  21 " \
+           "21  87634" \
+           " 3 1  7  " \
+           "  1  6 73" \
+           "3  71 562" \
+           " 7  3 4 1"
+
+EDITED = {
+    (3, 0): {8, 9},
+    (4, 0): {9, 6},
+    (3, 1): {2},
+    (4, 1): {2, 6},
+    (1, 2): {2},
+    (3, 2): {9, 5},
+    (5, 2): {5},
+    (0, 3): {5},
+    (5, 3): {9},
+    (0, 5): {5},
+    (2, 5): {9, 5},
+    (4, 5): {9, 4},
+    (5, 5): {9},
+    (0, 6): {9},
+    (1, 6): {9, 5},
+    (3, 6): {9},
+    (4, 6): {5},
+    (2, 7): {9},
+    (2, 8): {5},
+    (3, 8): {9}
+}
+
+
+class TestNishio(unittest.TestCase):
+    def test_solver_clears_nishio(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        cleared_cell = (3, 0)
+        cleared_digit = 5
+
+        self.assertTrue(solver.check_for_nishio())
+
+        self.assertFalse(cleared_digit in sudoku[cleared_cell].pencil_marks)
+
+
+if __name__ == '__main__':
+    unittest.main()
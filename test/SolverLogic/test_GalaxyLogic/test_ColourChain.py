@@ -1,5 +1,7 @@
 import unittest
 
+from src.Bitboard import KEYS, board_indices, seen_by_any
+from src.LinkGraph import two_colour
 from src.Solver import Solver
 from src.Sudoku import Sudoku
 
@@ -21,25 +23,9 @@ class Test_Colour_Chain_Methods(unittest.TestCase):
         ((2, 4), (0, 5)), ((5, 3), (3, 5)),  # boxes
     }
 
-    strongly_connected_9_chain_keys = (
-        [(2, 4), (0, 5), (0, 7), (8, 7)],
-        [(2, 4), (0, 5), (3, 5), (5, 3)],
-        [(8, 7), (0, 7), (0, 5), (3, 5), (5, 3)],
-    )
-
-    colour_chain_keys = [
-        [
-            [(2, 4), (0, 7)],
-            [(0, 5), (8, 7)]
-        ],
-        [
-            [(2, 4), (3, 5)],
-            [(0, 5), (5, 3)]
-        ],
-        [
-            [(8, 7), (0, 5), (5, 3)],
-            [(0, 7), (3, 5)]
-        ]
+    colour_keys = [
+        ({(1, 0)}, {(1, 2)}),
+        ({(5, 3), (0, 5), (8, 7)}, {(2, 4), (3, 5), (0, 7)}),
     ]
 
     def setUp(self) -> None:
@@ -60,16 +46,6 @@ class Test_Colour_Chain_Methods(unittest.TestCase):
             tuple(self.sudoku[key] for key in pair)
             for pair in self.strongly_connected_9_pair_keys
         }
-        self.strongly_connected_chains = [
-            [self.sudoku[key] for key in chain]
-            for chain in self.strongly_connected_9_chain_keys
-        ]
-        self.colour_chains = [
-            [
-                [self.sudoku[key] for key in chain]
-                for chain in pair
-            ] for pair in self.colour_chain_keys
-        ]
 
     def test_find_strongly_connected_pairs_with_digit(self):
         digit = 9
@@ -79,28 +55,34 @@ class Test_Colour_Chain_Methods(unittest.TestCase):
             self.sudoku.strongly_connected_pairs_with_digit(digit)
         )
 
-    def test_find_strongly_connected_chains(self):
-        self.assertEqual(
-            self.strongly_connected_chains,
-            self.solver.strongly_connected_cell_chains(self.strongly_connected_9_pair_cells)
-        )
-
-    def test_isolate_colour_chains(self):
-        self.assertEqual(
-            self.colour_chains,
-            self.solver.colour_pairs_for_strongly_connected_chains(self.strongly_connected_chains)
-        )
+    def test_colour_strongly_connected_cells(self):
+        graph = self.sudoku.updated(self.solver.link_graph)
+        colours = [
+            tuple({KEYS[index] for index in board_indices(board)} for board in component)
+            for component in graph.colour_components(9)
+        ]
+        self.assertEqual(self.colour_keys, colours)
 
-    def test_find_cells_seen_by_chain(self):
+    def test_find_cells_seen_by_both_colours(self):
         seen_keys = {
             (1, 3), (8, 4), (1, 5), (4, 7), (8, 5), (7, 5),
         }
-        seen_cells = {self.sudoku[key] for key in seen_keys}
+        graph = self.sudoku.updated(self.solver.link_graph)
+        a, b = graph.colour_components(9)[1]
+        seen = seen_by_any(a) & seen_by_any(b) & ~(a | b)
         self.assertEqual(
-            seen_cells,
-            self.solver.cells_seen_by_colour_chains(self.colour_chains)
+            seen_keys,
+            {KEYS[index] for index in board_indices(seen) if self.sudoku[KEYS[index]].is_empty}
         )
 
+    def test_colour_components_follow_candidate_changes(self):
+        graph = self.sudoku.updated(self.solver.link_graph)
+        self.assertEqual(2, len(graph.colour_components(9)))
+
+        self.sudoku[(1, 0)].pencil_marks.remove(9)
+        graph = self.sudoku.updated(self.solver.link_graph)
+        self.assertEqual(1, len(graph.colour_components(9)))
+
 
 class Test_Colour_Chain_Integration(unittest.TestCase):
     test_str = "    58   " \
@@ -187,16 +169,20 @@ class TestEdgeCases(unittest.TestCase):
             (7, 8): {}
         })
 
-    def test_solver_handles_chains_with_no_endpoints(self):
+    def test_solver_colours_chains_with_no_endpoints(self):
         pair_key_pairs = {
             ((4, 8), (5, 8)), ((5, 8), (5, 3)), ((5, 3), (3, 3)),
             ((3, 3), (3, 0)), ((3, 0), (4, 0)), ((4, 0), (4, 8)),
         }
-        pairs = {
-            tuple(self.sudoku[k] for k in pair)
-            for pair in pair_key_pairs
-        }
-        self.assertEqual([], self.solver.strongly_connected_cell_chains(pairs))
+        links = {}
+        for a, b in pair_key_pairs:
+            links.setdefault(KEYS.index(a), set()).add(KEYS.index(b))
+            links.setdefault(KEYS.index(b), set()).add(KEYS.index(a))
+        colours = [
+            {KEYS[index] for index in board_indices(board)}
+            for board in two_colour(links)[0]
+        ]
+        self.assertEqual([{(3, 0), (5, 3), (4, 8)}, {(4, 0), (3, 3), (5, 8)}], colours)
 
 
 if __name__ == '__main__':
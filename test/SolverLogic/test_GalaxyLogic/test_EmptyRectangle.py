@@ -1,5 +1,6 @@
 import unittest
 
+from src.Bitboard import EMPTY_RECTANGLES, INDEX, digit_planes, empty_rectangle_lines
 from src.Solver import Solver
 from src.Sudoku import Sudoku
 
@@ -49,18 +50,19 @@ class TestEmptyRectangleFunctions(unittest.TestCase):
         )
 
     def test_find_relevant_col_and_row(self):
-        rectangle = {self.sudoku[k] for k in [(7, 1), (8, 1), (7, 2), (8, 2)]}
-        relevant_col_num = 6
-        relevant_row_num = 0
-        self.assertEqual(relevant_row_num, self.solver.find_empty_rectangle_house("row", rectangle))
-        self.assertEqual(relevant_col_num, self.solver.find_empty_rectangle_house("column", rectangle))
+        # Box 2 can't be 1 at (7, 1), (8, 1), (7, 2) or (8, 2).
+        plane = digit_planes(self.sudoku.candidate_masks())[0]
+        self.assertEqual([(0, 6)], empty_rectangle_lines(plane, 2))
 
-    def test_find_empty_rectangle_perp_SC_cells(self):
-        relevant_row_num = 0
-        relevant_col_num = 6
-        expected = self.sudoku[5, 0]
-        self.assertEqual(expected,
-                         self.solver.find_empty_rectangle_perp_sc_cell(relevant_row_num, relevant_col_num, digit=1))
+    def test_find_empty_rectangle_targets(self):
+        graph = self.sudoku.updated(self.solver.link_graph)
+        targets = self.solver.empty_rectangle_targets(graph, 1, 2, 0, 6)
+        self.assertTrue(targets >> INDEX[(5, 0)] & 1)
+
+    def test_empty_rectangle_table(self):
+        self.assertEqual((), EMPTY_RECTANGLES[0b111])
+        self.assertEqual(((0, 1),), EMPTY_RECTANGLES[0b10111])
+        self.assertEqual(((0, 0), (1, 1)), EMPTY_RECTANGLES[0b1010])
 
 
 class TestEmptyRectangleIntegration(unittest.TestCase):
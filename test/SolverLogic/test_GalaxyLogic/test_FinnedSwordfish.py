@@ -59,8 +59,14 @@ class TestFinnedSwordfishColumn(unittest.TestCase):
 
     def test_solver_clears_finned_swordfish_in_columns(self):
         digit = 7
+        # Columns 2, 3 and 6 form a finned swordfish with its fin at
+        # (6, 7), which is found first, and columns 2, 3 and 8 form
+        # another with its fin at (8, 1).
+        first_cell = self.sudoku[8, 6]
         cell = self.sudoku[6, 0]
 
+        self.assertTrue(self.solver.check_for_fish())
+        self.assertFalse(digit in first_cell)
         self.assertTrue(self.solver.check_for_fish())
         self.assertFalse(digit in cell)
 
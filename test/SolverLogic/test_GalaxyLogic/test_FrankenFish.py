@@ -0,0 +1,58 @@
+"""
+Franken fish are fish (c.f. test_FinnedSwordfish) whose base and cover
+houses can include boxes as well as rows or columns. Here every place
+for 4 in box 1 and columns 6 and 8 lies in row 2 or in boxes 5 and 8,
+so the three 4s in the first three houses fill the last three, and the
+other cells in row 2 cannot contain 4.
+"""
+
+
+import unittest
+from itertools import product
+
+from src import Fish
+from src.Bitboard import INDEX, board_indices, digit_planes
+from src.Sudoku import Sudoku
+
+UNSOLVED = " 725 314 " \
+           "3  8215  " \
+           "1  7   2 " \
+           " 2     1 " \
+           "6 9 1 3  " \
+           "7 3     9" \
+           "2      5 " \
+           "    7   1" \
+           "    5  3 "
+
+
+class TestFrankenFish(unittest.TestCase):
+    def test_franken_fish_uses_boxes(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        plane = digit_planes(sudoku.candidate_masks())[3]
+        affected = {INDEX[(1, 2)], INDEX[(2, 2)]}
+
+        cleared = set()
+        for fish in Fish.find_franken_fish(plane, 3, "column"):
+            cleared.update(board_indices(Fish.fish_eliminations(plane, *fish)))
+
+        self.assertEqual(affected, cleared)
+
+    def test_line_fish_do_not_use_boxes(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        plane = digit_planes(sudoku.candidate_masks())[3]
+
+        self.assertFalse([fish for fish in Fish.find_line_fish(plane, 3, "column")
+                          if Fish.fish_eliminations(plane, *fish)])
+
+    def test_fish_by_variant_matches_find_fish(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        plane = digit_planes(sudoku.candidate_masks())[3]
+
+        for size, kind in product((2, 3, 4), ("row", "column")):
+            found = Fish.fish_by_variant(plane, size, kind, franken=True)
+            for variant in Fish.VARIANTS:
+                self.assertEqual(set(Fish.find_fish(plane, size, kind, variant, franken=True)), set(found[variant]))
+
+
+if __name__ == '__main__':
+    unittest.main()
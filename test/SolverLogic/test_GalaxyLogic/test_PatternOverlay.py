@@ -0,0 +1,81 @@
+"""
+Each digit's places in a solved sudoku form a template: nine cells, one
+in every row, column and box. Only templates which cover every place
+the digit has been filled in and use no cell which can't hold it are
+still possible, so an option in none of them can be removed.
+"""
+
+import unittest
+
+from src import Template
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+from src.Template import overlay, surviving_templates
+
+UNSOLVED = " 725 314 " \
+           "3  8215  " \
+           "1  7   23" \
+           " 2     1 " \
+           "6 9 1 3  " \
+           "713  5  9" \
+           "2      5 " \
+           "    7   1" \
+           "    5  3 "
+
+EDITED = {
+    (1, 2): {4},
+    (2, 2): {4},
+    (2, 6): {8, 4, 6},
+    (2, 8): {8, 4, 6},
+    (3, 8): {2}
+}
+
+
+class TestPatternOverlay(unittest.TestCase):
+    def test_templates(self):
+        every, by_cell = Template.template_tables()
+
+        self.assertEqual(46656, len(set(every)))
+        self.assertTrue(all(len(templates) == 5184 for templates in by_cell))
+
+    def test_overlay_fixes_filled_house(self):
+        # Once 1 is filled in at (0, 0), it can't be anywhere else in
+        # its row, column or box.
+        everywhere = (1 << 81) - 1
+        removed, fixed = overlay(everywhere & ~1, surviving_templates(everywhere & ~1, 1))
+
+        self.assertEqual(20, removed.bit_count())
+        self.assertEqual(0, fixed)
+
+    def test_templates_narrow_from_earlier_survivors(self):
+        everywhere = (1 << 81) - 1
+        earlier = surviving_templates(everywhere & ~1, 1)
+        # Fill 1 in at (4, 1) and rule it out of (7, 2).
+        plane = everywhere & ~(1 | 1 << 13 | 1 << 25)
+        survivors = surviving_templates(plane, 1 | 1 << 13)
+
+        self.assertTrue(0 < len(survivors) < len(earlier))
+        self.assertEqual(survivors, surviving_templates(plane, 1 | 1 << 13, earlier))
+
+    def test_solver_clears_pattern_overlay(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+
+        self.assertTrue(solver.check_for_pattern_overlay())
+        self.assertNotIn(8, sudoku[8, 3].pencil_marks)
+
+    def test_overlay_follows_fills(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        solver = Solver(sudoku)
+        solver.check_for_pattern_overlay()
+        # (0, 3) holds 4 in the solution.
+        sudoku[0, 3].fill(4)
+        sudoku.update_pencil_marks()
+        solver.check_for_pattern_overlay()
+
+        plane, placed = sudoku.update_versions()[3], sudoku.filled_planes()[3]
+        self.assertEqual(overlay(plane, surviving_templates(plane, placed)), solver.digit_cache["overlay", 4][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+If two houses each have only two places for a digit, and one place
+from each house sees the other, then at most one of those two can be
+the digit. At least one of the other two places must therefore be the
+digit, and any cell which sees both of them can have the digit cleared
+from its options. Skyscrapers and 2-String Kites are turbot fish in
+rows and columns.
+"""
+
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = " 5 8 2  1" \
+           "8 21 6   " \
+           "1 457328 " \
+           " 81257 4 " \
+           "   4 9812" \
+           "429 18   " \
+           "21 7 4 9 " \
+           " 7 9   2 " \
+           "948 2  7 "
+
+EDITED = {
+    (6, 0): {3, 6, 7},
+    (6, 1): {4, 9},
+    (0, 4): {3, 6},
+    (2, 4): {3, 6},
+    (6, 7): {5},
+    (6, 8): {5}
+}
+
+
+class TestTurbotFish(unittest.TestCase):
+    def test_solver_clears_turbot_fish(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        # The only 6s in row 2 are (1, 2) and (8, 2), and in box 3 are
+        # (0, 3) and (1, 4). (1, 2) and (1, 4) share column 1.
+        cleared_cells = {(8, 3)}
+        cleared_digit = 6
+
+        self.assertFalse(solver.check_for_two_string_kite())
+        self.assertTrue(solver.check_for_turbot_fish())
+
+        for key in cleared_cells:
+            self.assertFalse(cleared_digit in sudoku[key].pencil_marks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+If a digit can only be in two places in a row, and only in two places
+in a column, and one place from the row shares a box with one place
+from the column, then at most one of those two can be the digit. At
+least one of the other place in the row and the other place in the
+column must therefore be the digit, and any cell which sees both of
+them can have the digit cleared from its options.
+"""
+
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = " 5 8 2  1" \
+           "8 21 6   " \
+           "1 457328 " \
+           " 81257 4 " \
+           "   4 9812" \
+           "429 18   " \
+           "21 7 4 9 " \
+           " 7 9   2 " \
+           "948 2  7 "
+
+EDITED = {
+    (6, 0): {3, 6, 7},
+    (6, 1): {3, 4, 9},
+    (8, 1): {3, 9},
+    (8, 3): {6},
+    (0, 4): {3, 6},
+    (2, 4): {3, 6},
+    (7, 5): {3},
+    (8, 5): {5},
+    (6, 7): {5},
+    (6, 8): {5}
+}
+
+
+class TestTwoStringKite(unittest.TestCase):
+    def test_solver_clears_two_string_kites(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        # The only 6s in row 3 are (0, 3) and (6, 3), and in column 7
+        # are (7, 0) and (7, 5). (6, 3) and (7, 5) share a box.
+        cleared_cells = {(0, 0)}
+        cleared_digit = 6
+
+        self.assertTrue(solver.check_for_two_string_kite())
+
+        for key in cleared_cells:
+            self.assertFalse(cleared_digit in sudoku[key].pencil_marks)
+
+    def test_conjugate_houses_follow_candidate_changes(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        graph = sudoku.updated(solver.link_graph)
+        # Cell indices of (0, 3) and (6, 3).
+        self.assertIn((3, (27, 33)), graph.conjugate_houses(6))
+
+        sudoku[(6, 3)].pencil_marks.remove(6)
+        graph = sudoku.updated(solver.link_graph)
+        self.assertNotIn(3, dict(graph.conjugate_houses(6)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+If four or more cells each contain only the same two options, x and y,
+and form a chain in which each cell sees the next, then the cells in
+the chain alternate between x and y. Any cell which sees one cell at an
+odd position in the chain and one at an even position must see both an
+x and a y, so it can have both cleared from its options.
+"""
+
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "63 25    " \
+           " 5836    " \
+           "1 2 48536" \
+           " 135 46  " \
+           "   6    4" \
+           "8  19  57" \
+           "  142 86 " \
+           "   836971" \
+           " 8  1 4  "
+
+EDITED = {
+    (7, 1): {2},
+    (7, 3): {2},
+    (5, 4): {7},
+    (7, 4): {2},
+    (1, 5): {2},
+    (0, 6): {5},
+    (0, 8): {2, 5},
+    (2, 8): {5}
+}
+
+
+class TestRemotePair(unittest.TestCase):
+    def test_solver_clears_remote_pairs(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        # The chain is (1, 6), (1, 2), (3, 2), (3, 8), which all
+        # contain only 7 and 9.
+        cleared_cells = {(5, 6), (0, 8), (2, 8)}
+        cleared_digits = {7, 9}
+
+        self.assertTrue(solver.check_for_remote_pair())
+
+        for key in cleared_cells:
+            self.assertFalse(cleared_digits & sudoku[key].pencil_marks)
+
+    def test_solver_ignores_short_chains(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        sudoku[(3, 8)].pencil_marks.add(2)
+
+        self.assertFalse(solver.check_for_remote_pair())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+If two cells which do not see each other both contain only the same
+two options, x and y, and there is a house in which y can only be in
+two places, one of which sees each of the two cells, then at most one
+of the two cells can be y. At least one of them must therefore be x,
+and cells which see both of them can have x cleared from their options.
+"""
+
+
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = "    3  84" \
+           "       6 " \
+           " 42   379" \
+           "1   8 9  " \
+           "27   98 6" \
+           "9853 6 41" \
+           "  9 6  28" \
+           " 2 7 8 93" \
+           "     3 1 "
+
+EDITED = {
+    (3, 0): {1, 5},
+    (5, 0): {1, 5},
+    (3, 1): {1, 2, 5},
+    (4, 1): {1, 2, 4, 5},
+    (5, 1): {1, 5},
+    (0, 2): {5},
+    (3, 2): {1, 5},
+    (8, 3): {5},
+    (2, 7): {4},
+    (2, 8): {4},
+    (3, 8): {4, 5},
+    (4, 8): {4, 5}
+}
+
+
+class TestWWing(unittest.TestCase):
+    def test_solver_clears_wwings(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        solver = Solver(sudoku)
+        # The wings are (5, 0) and (6, 5), which both contain 2 and 7,
+        # linked by the only 7s in column 4, at (4, 1) and (4, 5).
+        cleared_cells = {(6, 0)}
+        cleared_digit = 2
+
+        self.assertTrue(solver.check_for_wwing())
+
+        for key in cleared_cells:
+            self.assertFalse(cleared_digit in sudoku[key].pencil_marks)
+
+    def test_bivalue_index_groups_cells_by_pair(self):
+        sudoku = Sudoku.from_string(UNSOLVED, EDITED)
+        bivalues = sudoku.bivalues()
+        # Cell indices of (5, 0), (8, 3), (4, 5) and (6, 5).
+        self.assertEqual([5, 35, 49, 51], bivalues.with_pair(0b1000010))
+
+        sudoku[(6, 5)].pencil_marks.remove(2)
+        bivalues = sudoku.bivalues()
+        self.assertEqual([5, 35, 49], bivalues.with_pair(0b1000010))
+        self.assertNotIn(51, bivalues.peers(49))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 
+from src.Bitboard import CELL_HOUSES, CELL_RECTANGLES, PEER_BOARDS, RECTANGLES, rectangles_where, seen_by_any
 from src.Solver import list_diff
+from src.Sudoku import Sudoku
 
 
 class Test_Helper_Functions(unittest.TestCase):
@@ -11,6 +13,37 @@ class Test_Helper_Functions(unittest.TestCase):
         actual = list_diff(a, b)
         self.assertEqual(expected, actual)
 
+    def test_rectangles_span_two_boxes(self):
+        self.assertEqual(486, len(RECTANGLES))
+        for rectangle in RECTANGLES:
+            self.assertEqual(2, len({CELL_HOUSES[index][2] for index in rectangle}))
+
+    def test_rectangles_where_only_tries_rectangles_of_bivalue_cells(self):
+        sudoku = Sudoku.from_string(" " * 81)
+        sudoku[0, 0].pencil_marks = {1, 2}
+        bivalues = sudoku.bivalues()
+
+        found = list(rectangles_where(sudoku.masks, lambda *corners: True, bivalues))
+
+        self.assertEqual([RECTANGLES[r] for r in CELL_RECTANGLES[0]], found)
+
+    def test_rectangles_where_only_tries_rectangles_with_given_cells(self):
+        sudoku = Sudoku.from_string(" " * 81)
+        sudoku[0, 0].pencil_marks = {1, 2}
+        sudoku[1, 1].pencil_marks = {1, 2}
+        bivalues = sudoku.bivalues()
+
+        found = list(rectangles_where(sudoku.masks, lambda *corners: True, bivalues, [8]))
+
+        self.assertTrue(found)
+        for rectangle in found:
+            self.assertIn(8, rectangle)
+            self.assertTrue({0, 10} & set(rectangle))
+
+    def test_seen_by_any(self):
+        self.assertEqual(PEER_BOARDS[0] | PEER_BOARDS[80], seen_by_any(1 | 1 << 80))
+        self.assertEqual(0, seen_by_any(0))
+
 
 if __name__ == '__main__':
     unittest.main()
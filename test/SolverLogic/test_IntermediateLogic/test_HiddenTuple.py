@@ -9,6 +9,7 @@ from those cells.
 import unittest
 
 from src.Solver import Solver
+from src.SubsetIndex import hidden_subsets
 from src.Sudoku import Sudoku
 
 ROW_PAIR = " 19 3    " \
@@ -306,5 +307,17 @@ class TestHiddenTupleBox(unittest.TestCase):
                 self.assertTrue(digit in options)
 
 
+class TestHiddenSubsets(unittest.TestCase):
+    def test_hidden_subsets_searches_digit_positions(self):
+        # Digits 1 and 2 only fit in the first two cells of the row.
+        # Digits 1-4 only fit in the first four cells too, but those
+        # cells have no other options to remove.
+        masks = [0] * 81
+        masks[:9] = [0b000000111, 0b000001011, 0b000001100, 0b000001100] + [0b111110000] * 5
+        row = tuple(range(9))
+
+        self.assertEqual([([0, 1], 0b11)], hidden_subsets(masks, row))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+"""
+Two groups of cells whose digits must be the same, once some number of
+full sets of 1-9 is added to one of them, form a set equivalence. When
+every cell but one in the groups is filled, the empty cell must hold
+the digit which balances them.
+"""
+
+import unittest
+
+from src.Bitboard import INDEX
+from src.SetEquivalence import SetConstraint, SetIndex
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+UNSOLVED = " 1234567 " \
+           "3        " \
+           "4        " \
+           "1        " \
+           "2        " \
+           "5        " \
+           "6        " \
+           "7        " \
+           "8        "
+
+ROW = [INDEX[x, 0] for x in range(9)]
+COLUMN = [INDEX[0, y] for y in range(9)]
+
+
+class TestSetEquivalence(unittest.TestCase):
+    def test_shared_cells_cancel_out(self):
+        constraint = SetConstraint(ROW, COLUMN)
+
+        self.assertNotIn(INDEX[0, 0], constraint.left)
+        self.assertNotIn(INDEX[0, 0], constraint.right)
+        self.assertEqual(8, len(constraint.left))
+
+    def test_groups_must_balance(self):
+        with self.assertRaises(ValueError):
+            SetConstraint(ROW, COLUMN[:5])
+
+    def test_index_only_updates_changed_constraints(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        index = SetIndex([SetConstraint(ROW, COLUMN)])
+        sudoku.updated(index)
+
+        self.assertEqual([(INDEX[8, 0], 8)], index.placements("user"))
+
+        sudoku[8, 0].fill(9)
+        sudoku.updated(index)
+
+        self.assertEqual([], index.placements("user"))
+
+    def test_solver_fills_user_set_single(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        solver = Solver(sudoku)
+        solver.set_index.add(SetConstraint(ROW, COLUMN))
+
+        self.assertTrue(solver.check_for_set_equivalence_singles())
+        self.assertEqual(8, sudoku[8, 0].digit)
+        self.assertFalse(solver.check_for_set_equivalence_singles())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,6 @@
+import gc
+import os
+import tracemalloc
 import unittest
 
 from src.Solver import Solver
@@ -25,6 +28,71 @@ class TestSolverStep(unittest.TestCase):
         self.assertFalse(sudoku[0, 0].is_empty)
 
 
+class TestSolverAllocations(unittest.TestCase):
+    # Nothing simpler than an alternating inference chain applies here
+    # (c.f. test_AIC), so each step runs the subset, fish and chain
+    # searches over the whole grid.
+    unsolved = "915  46 8" \
+               " 639  4  " \
+               " 24 61 9 " \
+               "682 93 4 " \
+               "35914  62" \
+               "14762 9  " \
+               "298  6  4" \
+               "5364    9" \
+               "471  9 56"
+    edited = {
+        (5, 1): {8, 7},
+        (5, 7): {8},
+        (7, 7): {2}
+    }
+
+    def test_step_stays_within_allocation_budget(self):
+        sudoku = Sudoku.from_string(self.unsolved, self.edited)
+        solver = Solver(sudoku)
+        # The first step fills the indexes and caches and clears the
+        # chain; the second runs every search up to the XYZ-Wing.
+        self.assertEqual(("chain", "Alternating Inference Chain"), solver.step(message=True))
+        gc.collect()
+        in_src = [tracemalloc.Filter(True, os.path.join("*", "src", "*"))]
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot().filter_traces(in_src)
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            self.assertEqual(("brutal", "XYZ-Wing"), solver.step(message=True))
+            peak = tracemalloc.get_traced_memory()[1] - start
+            after = tracemalloc.take_snapshot().filter_traces(in_src)
+        finally:
+            tracemalloc.stop()
+
+        allocated = sum(stat.count_diff for stat in after.compare_to(before, "lineno"))
+        self.assertLess(peak, 8 * 1024)
+        self.assertLess(allocated, 75)
+
+
+class TestSolverCache(unittest.TestCase):
+    def test_cache_is_reused_until_digit_changes(self):
+        sudoku = Sudoku.from_string(" " * 81)
+        solver = Solver(sudoku)
+        calls = []
+        sudoku.update_versions()
+
+        solver.cached("test", 1, lambda: calls.append(1))
+        solver.cached("test", 1, lambda: calls.append(1))
+        self.assertEqual(1, len(calls))
+
+        sudoku[0, 0].remove(2)
+        sudoku.update_versions()
+        solver.cached("test", 1, lambda: calls.append(1))
+        self.assertEqual(1, len(calls))
+
+        sudoku[0, 0].remove(1)
+        sudoku.update_versions()
+        solver.cached("test", 1, lambda: calls.append(1))
+        self.assertEqual(2, len(calls))
+
+
 @unittest.skip("Run only separately")
 class TestFullSolve(unittest.TestCase):
     easy_unsolved = "6    85  " \
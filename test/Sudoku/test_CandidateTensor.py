@@ -0,0 +1,71 @@
+import unittest
+
+from src.Solver import Solver
+from src.Sudoku import Sudoku
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+UNSOLVED = " 725 3 4 " \
+           "3  8  5  " \
+           "1  7   2 " \
+           " 2     1 " \
+           "6 9 1 3  " \
+           "7 3     9" \
+           "2      5 " \
+           "    7   1" \
+           "    5  3 "
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestCandidateTensor(unittest.TestCase):
+    def test_fill_clears_peers(self):
+        sudoku = Sudoku.from_string(" " * 81)
+        sudoku.use_numpy()
+        sudoku[0, 0].fill(5)
+
+        self.assertEqual(0b111101111, sudoku.tensor.masks()[8])
+        self.assertIn(5, sudoku[8, 0].pencil_marks)
+        sudoku.update_pencil_marks()
+        self.assertNotIn(5, sudoku[8, 0].pencil_marks)
+        self.assertEqual(sudoku.candidate_masks(), sudoku.tensor.masks())
+
+    def test_remove_and_clear_edit_the_tensor(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        sudoku.use_numpy()
+        sudoku[0, 0].remove(9)
+        sudoku[1, 0].clear()
+
+        self.assertEqual(sudoku.candidate_masks(), sudoku.tensor.masks())
+
+    def test_house_counts(self):
+        sudoku = Sudoku.from_string(" " * 81)
+        sudoku.use_numpy()
+        counts = sudoku.tensor.house_counts()
+
+        self.assertEqual((27, 9), counts.shape)
+        self.assertTrue((counts == 9).all())
+
+    def test_hidden_single_matches_solver(self):
+        sudoku = Sudoku.from_string(UNSOLVED)
+        solver = Solver(sudoku)
+        expected = solver.hidden_single()
+        sudoku.use_numpy()
+
+        self.assertEqual(expected, sudoku.tensor.hidden_single())
+
+    def test_solver_steps_match_with_numpy(self):
+        expected = Sudoku.from_string(UNSOLVED)
+        sudoku = Sudoku.from_string(UNSOLVED)
+        sudoku.use_numpy()
+        python_solver, numpy_solver = Solver(expected), Solver(sudoku)
+        for _ in range(30):
+            self.assertEqual(python_solver.step(message=True), numpy_solver.step(message=True))
+            self.assertEqual(expected.candidate_masks(), sudoku.candidate_masks())
+            self.assertEqual(expected.candidate_masks(), sudoku.tensor.masks())
+
+
+if __name__ == '__main__':
+    unittest.main()
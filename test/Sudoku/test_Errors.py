@@ -32,4 +32,12 @@ class TestSudokuErrors(unittest.TestCase):
     def test_creating_sudoku_with_duplicates_in_box_raises_value_error(self) -> None:
         with self.assertRaises(ValueError):
             double_box: str = "1         1       " + (" " * 63)
-            Sudoku.from_string(double_box)
\ No newline at end of file
+            Sudoku.from_string(double_box)
+
+    def test_creating_non_unique_sudoku_with_unique_flag_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            Sudoku.from_string(" " * 81, unique=True)
+
+    def test_creating_unsolvable_sudoku_with_unique_flag_raises_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            Sudoku.from_string("12345678 " "        9" + " " * 63, unique=True)
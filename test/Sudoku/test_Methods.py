@@ -2,6 +2,7 @@ import json
 import os
 import unittest
 
+from src.Bitboard import digit_planes
 from src.Sudoku import Sudoku
 
 
@@ -102,6 +103,51 @@ class TestSudokuMethods(unittest.TestCase):
         sudoku.clear(x, y)
         self.assertTrue(sudoku[x, y].is_empty)
 
+    def test_count_solutions_of_unique_sudoku(self):
+        sudoku = Sudoku.from_string(
+            "   4     "
+            "    9 31 "
+            " 2  574 6"
+            "      7 4"
+            " 7  6  2 "
+            "  9      "
+            "7 481  6 "
+            " 63  5   "
+            " 5   2   "
+        )
+        self.assertEqual(1, sudoku.count_solutions())
+
+    def test_count_solutions_stops_at_limit(self):
+        sudoku = Sudoku.from_string(" " * 81)
+        self.assertEqual(2, sudoku.count_solutions())
+        self.assertEqual(5, sudoku.count_solutions(limit=5))
+
+    def test_count_solutions_of_unsolvable_sudoku(self):
+        sudoku = Sudoku.from_string("12345678 " "        9" + " " * 63)
+        self.assertEqual(0, sudoku.count_solutions())
+
+    def test_planes_match_candidate_masks(self):
+        sudoku = Sudoku.from_string("12345678 " "        9" + " " * 63)
+        planes = sudoku.update_versions()
+        self.assertEqual(digit_planes(sudoku.candidate_masks()), planes)
+        self.assertEqual(1 << 1, sudoku.filled_planes()[1])
+
+    def test_versions_only_change_with_candidates(self):
+        sudoku = Sudoku.from_string(" " * 81)
+        planes = sudoku.update_versions()
+        digits, houses = list(sudoku.digit_versions), list(sudoku.house_versions)
+
+        sudoku.update_versions()
+        self.assertEqual(digits, sudoku.digit_versions)
+
+        sudoku[0, 0].remove(5)
+        sudoku.update_versions()
+        self.assertEqual(digits[4] + 1, sudoku.digit_versions[4])
+        self.assertEqual(digits[3], sudoku.digit_versions[3])
+        # Row 0, column 0 and box 0.
+        self.assertEqual([0, 9, 18], sudoku.changed_houses(houses))
+        self.assertEqual(planes[4] & ~1, sudoku.planes[4])
+
 
 class TestSudokuProperties(unittest.TestCase):
     boxes = {1: [(0, 0), (1, 0), (2, 0),